@@ -1,25 +1,37 @@
 import os
-from dotenv import load_dotenv
-
-# Load environment variables from the .env file
-load_dotenv()
 
 
 class Config:
-    """Configuration class to manage environment variables."""
+    """
+    Configuration class to manage environment variables.
+    Nothing is read at import time: `.env` and the environment are loaded on first use.
+    """
+
+    API_KEY = None
+    PRIVATE_KEY = None
+    PROFILER_PORT = None  # Local port for the profiler control socket, disabled unless set
+    _loaded = False
 
-    API_KEY = os.getenv("API_KEY")
-    PRIVATE_KEY = os.getenv("PRIVATE_KEY")
+    @classmethod
+    def load(cls):
+        """Load environment variables from the .env file, once."""
+        if not cls._loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            cls.API_KEY = os.getenv("API_KEY")
+            cls.PRIVATE_KEY = os.getenv("PRIVATE_KEY")
+            port = os.getenv("PROFILER_PORT", "").strip()
+            cls.PROFILER_PORT = int(port) if port.isdigit() else None
+            cls._loaded = True
+        return cls
 
     @classmethod
     def validate(cls):
         """Ensure all required environment variables are set."""
+        cls.load()
         missing_vars = [var for var in ["API_KEY", "PRIVATE_KEY"] if not getattr(cls, var)]
         if missing_vars:
             raise EnvironmentError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
         return True
-
-
-# Validate configuration at import
-Config.validate()
@@ -1,4 +1,9 @@
 from view.main_screen.main_screen import MainScreenView
+from config.config import Config
+from config.logging_config import logger
+from services.history_store import HistoryStore
+from services.profiler import ProfilerControlServer
+from services.tick_recorder import TickRecorder
 from services.trading_bot import TradingBot
 
 
@@ -11,7 +16,20 @@ class MainScreenController:
     def __init__(self, model):
         self.model = model  # MainScreenModel
         self.view = MainScreenView(controller=self, model=self.model)
-        self.bot = TradingBot(model=self.model.bot)  # Pass the TradingBotModel to the bot logic
+        self.store = HistoryStore()  # Persists trades and ticks across restarts
+        self.recorder = TickRecorder()  # Raw bid/ask quotes for spread-aware backtests
+        # Pass the TradingBotModel to the bot logic
+        self.bot = TradingBot(model=self.model.bot, store=self.store, recorder=self.recorder)
+
+        # Local control socket for profiling the running bot (see services/profiler.py).
+        # Any local process can connect to it, so it only opens when PROFILER_PORT is set.
+        self.profiler_server = None
+        if Config.load().PROFILER_PORT:
+            try:
+                self.profiler_server = ProfilerControlServer(self.bot.profiler, port=Config.PROFILER_PORT)
+                self.profiler_server.start()
+            except OSError as e:
+                logger.warning(f"Profiler control socket unavailable on port {Config.PROFILER_PORT}: {e}")
 
     def get_view(self) -> MainScreenView:
         return self.view
@@ -21,7 +39,11 @@ class MainScreenController:
         Start the trading bot.
         """
         if not self.bot.is_running:
-            self.bot.start()  # Calls TradingBot.run() in a thread
+            try:
+                self.bot.start()  # Calls TradingBot.run() in a thread
+            except EnvironmentError as e:
+                logger.error(f"Cannot start the trading bot: {e}")
+                return
 
             self.model.is_bot_running = True
 
@@ -32,3 +54,10 @@ class MainScreenController:
         if self.bot.is_running:
             self.bot.stop()  # Calls a method in TradingBot to stop the bot gracefully
             self.model.is_bot_running = False
+
+    def profile_bot(self, iterations=10):
+        """
+        Record a CPU profile of the next bot iterations and time every strategy.
+        """
+        self.bot.profiler.set_timers(True)
+        self.bot.profiler.start_cpu_profile(iterations)
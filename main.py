@@ -9,43 +9,17 @@ You can read more about this template at the links below:
 
 https://github.com/HeaTTheatR/LoginAppMVC
 https://en.wikipedia.org/wiki/Model–view–controller
-"""
-
-from kivymd.app import MDApp
-from kivymd.uix.screenmanager import MDScreenManager
-
-from view.screens import screens
 
+KivyMD and the screens are imported only when the app is started, so importing
+this module (e.g. in spawned strategy worker processes) stays cheap.
+"""
 
-class MyApp(MDApp):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.load_all_kv_files(self.directory)
-        # This is the screen manager that will contain all the screens of your
-        # application.
-        self.manager_screens = MDScreenManager()
-        
-    def build(self) -> MDScreenManager:
-        self.generate_application_screens()
-        return self.manager_screens
-
-    def generate_application_screens(self) -> None:
-        """
-        Creating and adding screens to the screen manager.
-        You should not change this cycle unnecessarily. He is self-sufficient.
 
-        If you need to add any screen, open the `View.screens.py` module and
-        see how new screens are added according to the given application
-        architecture.
-        """
+def main():
+    from view.app import MyApp
 
-        for i, name_screen in enumerate(screens.keys()):
-            model = screens[name_screen]["model"]()
-            controller = screens[name_screen]["controller"](model)
-            view = controller.get_view()
-            view.manager_screens = self.manager_screens
-            view.name = name_screen
-            self.manager_screens.add_widget(view)
+    MyApp().run()
 
 
-MyApp().run()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import heapq
+from collections import deque
+
+
+class AlignedPriceView:
+    def __init__(self, symbols, max_staleness=None, capacity=500):
+        """
+        Live as-of join of several symbols' prices, the streaming counterpart of
+        `simulation.alignment.asof_join`. Every new timestamp adds a row holding the
+        latest price of each symbol, or None where it is missing or too old.
+        :param symbols: Asset codes, in column order.
+        :param max_staleness: Largest allowed age of a forward-filled price, in seconds.
+        :param capacity: Number of aligned rows kept.
+        """
+        self.symbols = tuple(symbols)
+        self.max_staleness = max_staleness
+        self._latest = {}  # symbol -> (timestamp, price)
+        self._times = deque(maxlen=capacity)
+        self._rows = deque(maxlen=capacity)
+
+    def update(self, symbol, price, timestamp):
+        """Record a price; ticks sharing a timestamp (one bot tick) fill the same row."""
+        previous = self._latest.get(symbol)
+        if previous is not None and timestamp < previous[0]:
+            return  # Out-of-order tick, the newer price stays in effect
+        self._latest[symbol] = (timestamp, price)
+
+        if self._times and timestamp < self._times[-1]:
+            return
+        row = self.values_at(timestamp)
+        if self._times and timestamp == self._times[-1]:
+            self._rows[-1] = row
+        else:
+            self._times.append(timestamp)
+            self._rows.append(row)
+
+    def load(self, history):
+        """
+        Replay historical prices from several symbols in time order.
+        :param history: Mapping of asset code to (timestamp in seconds, price) pairs, oldest first.
+        """
+        streams = [[(timestamp, symbol, price) for timestamp, price in rows] for symbol, rows in history.items()]
+        merged = heapq.merge(*streams, key=lambda event: event[0])
+        for timestamp, symbol, price in merged:
+            self.update(symbol, price, timestamp)
+
+    def values_at(self, timestamp):
+        """Tuple of the latest price per symbol as of `timestamp`, None where missing or stale."""
+        values = []
+        for symbol in self.symbols:
+            latest = self._latest.get(symbol)
+            if latest is None or (self.max_staleness is not None and timestamp - latest[0] > self.max_staleness):
+                values.append(None)
+            else:
+                values.append(latest[1])
+        return tuple(values)
+
+    def latest(self, now=None):
+        """
+        Current aligned prices as {asset code: price or None}.
+        :param now: Optional time to judge staleness against, defaults to the newest row.
+        """
+        if now is None:
+            if not self._times:
+                return dict.fromkeys(self.symbols)
+            now = self._times[-1]
+        return dict(zip(self.symbols, self.values_at(now)))
+
+    def history(self):
+        """Return (timestamps, {asset code: prices}) for the kept rows, oldest first."""
+        rows = list(self._rows)
+        columns = {symbol: [row[index] for row in rows] for index, symbol in enumerate(self.symbols)}
+        return list(self._times), columns
@@ -0,0 +1,154 @@
+import time
+from collections import deque
+
+from config.logging_config import logger
+
+# Supported bar timeframes and their length in seconds
+TIMEFRAMES = {
+    "1m": 60,
+    "5m": 300,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+
+class Bar:
+    __slots__ = ("symbol", "timeframe", "start", "open", "high", "low", "close", "volume", "ticks")
+
+    def __init__(self, symbol, timeframe, start, price, volume=0):
+        """
+        A single OHLCV candle.
+        :param start: Bar start time in seconds since the epoch, aligned to the timeframe.
+        :param volume: Traded volume when known; the live feed only has quotes, so `ticks` counts updates.
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.start = start
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = volume
+        self.ticks = 1
+
+    def update(self, price, volume=0):
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+        self.ticks += 1
+
+    def __repr__(self):
+        return (
+            f"Bar("
+            f"{self.symbol} {self.timeframe} @ {self.start}, "
+            f"O: {self.open:.2f}, H: {self.high:.2f}, L: {self.low:.2f}, C: {self.close:.2f}, "
+            f"Ticks: {self.ticks}"
+            f")"
+        )
+
+
+class BarBuilder:
+    def __init__(self, timeframes=("1m", "5m", "1h", "1d"), max_bars=500):
+        """
+        Roll raw ticks into OHLCV bars per symbol and timeframe.
+        Memory is bounded: only the last `max_bars` closed bars are kept per timeframe.
+        A bar closes when the first tick of a later bar arrives; empty periods produce no bar.
+        """
+        unknown = [timeframe for timeframe in timeframes if timeframe not in TIMEFRAMES]
+        if unknown:
+            raise ValueError(f"Unsupported timeframes: {', '.join(unknown)}")
+
+        self.timeframes = tuple(timeframes)
+        self.max_bars = max_bars
+        self._closed = {}  # (symbol, timeframe) -> deque of closed bars
+        self._current = {}  # (symbol, timeframe) -> bar still being built
+        self._subscribers = {timeframe: [] for timeframe in self.timeframes}
+
+    def subscribe(self, timeframe, callback):
+        """Call `callback(bar)` every time a bar of `timeframe` closes."""
+        if timeframe not in self._subscribers:
+            raise ValueError(f"Timeframe not tracked: {timeframe}")
+        self._subscribers[timeframe].append(callback)
+
+    def unsubscribe(self, timeframe, callback):
+        self._subscribers[timeframe].remove(callback)
+
+    def update(self, symbol, price, timestamp=None, volume=0):
+        """
+        Add a tick for `symbol`.
+        :param timestamp: Tick time in seconds since the epoch, defaults to now.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+
+        for timeframe in self.timeframes:
+            key = (symbol, timeframe)
+            start = timestamp - timestamp % TIMEFRAMES[timeframe]
+            bar = self._current.get(key)
+
+            if bar is None:
+                self._current[key] = Bar(symbol, timeframe, start, price, volume)
+            elif start == bar.start:
+                bar.update(price, volume)
+            elif start > bar.start:
+                self._close(key, bar)
+                self._current[key] = Bar(symbol, timeframe, start, price, volume)
+            else:
+                logger.debug(f"Ignoring out-of-order tick for {symbol} at {timestamp}.")
+
+    def _close(self, key, bar):
+        closed = self._closed.get(key)
+        if closed is None:
+            closed = self._closed[key] = deque(maxlen=self.max_bars)
+        closed.append(bar)
+
+        for callback in self._subscribers[bar.timeframe]:
+            try:
+                callback(bar)
+            except Exception as e:
+                logger.error(f"Error in bar subscriber {callback}: {e}", exc_info=True)
+
+    def get_bars(self, symbol, timeframe, include_current=False):
+        """Return closed bars oldest first, optionally followed by the bar still being built."""
+        bars = list(self._closed.get((symbol, timeframe), ()))
+        if include_current and (symbol, timeframe) in self._current:
+            bars.append(self._current[(symbol, timeframe)])
+        return bars
+
+    def current_bar(self, symbol, timeframe):
+        return self._current.get((symbol, timeframe))
+
+    def load_history(self, symbol, rows):
+        """
+        Rebuild all timeframes for `symbol` from historical (timestamp_ms, price) rows in one pass
+        per timeframe. Replaces any bars already held for the symbol and does not notify subscribers.
+        """
+        rows = sorted(rows, key=lambda row: row[0])
+        for timeframe in self.timeframes:
+            seconds = TIMEFRAMES[timeframe]
+            closed = deque(maxlen=self.max_bars)
+            bar = None
+
+            for timestamp_ms, price in rows:
+                timestamp = timestamp_ms / 1000
+                start = timestamp - timestamp % seconds
+                if bar is not None and start == bar.start:
+                    bar.update(price)
+                else:
+                    if bar is not None:
+                        closed.append(bar)
+                    bar = Bar(symbol, timeframe, start, price)
+
+            self._closed[(symbol, timeframe)] = closed
+            if bar is not None:
+                self._current[(symbol, timeframe)] = bar
+            else:
+                self._current.pop((symbol, timeframe), None)
+
+    def load_csv(self, symbol, filename):
+        """Rebuild the bars for `symbol` from a `timestamp,price` CSV such as `simulation/btc_prices.csv`."""
+        from simulation.backtest import load_prices
+
+        self.load_history(symbol, load_prices(filename))
@@ -14,6 +14,10 @@ class MovingAverageStrategy(TradingStrategy):
         self.record_trade = record_trade_callback
         self.required_profit_percent = required_profit_percent / 100  # Convert percentage to decimal
 
+    def warm_up(self, symbol, prices):
+        if symbol in self.moving_averages:
+            self.moving_averages[symbol].seed(prices)
+
     def evaluate(self, symbol, price):
         ma = self.moving_averages[symbol]  # Get the specific MovingAverage instance
         short_ma, long_ma = ma.update(price)
@@ -38,8 +42,9 @@ class MovingAverageStrategy(TradingStrategy):
             if last_buy_price is None or price < last_buy_price * (1 - self.required_profit_percent):
                 amount_to_buy = (wallet.get_balance("USD") * 0.5) / price
                 if amount_to_buy > 0:  # Prevent zero/negative trades
-                    wallet.update_balance(symbol, amount_to_buy, "BUY", price)
-                    self.record_trade("Moving Average", "BUY", symbol, amount_to_buy, price,
+                    fill_price = self.model.get_fill_price(symbol, "BUY", amount_to_buy, price)
+                    wallet.update_balance(symbol, amount_to_buy, "BUY", fill_price)
+                    self.record_trade("Moving Average", "BUY", symbol, amount_to_buy, fill_price,
                                       wallet.get_balance("USD"), wallet.get_balance(symbol))
                 else:
                     logger.warning(f"Skipping BUY for {symbol} due to insufficient calculated amount to buy.")
@@ -50,8 +55,9 @@ class MovingAverageStrategy(TradingStrategy):
             if last_sell_price is None or price > last_sell_price * (1 + self.required_profit_percent):
                 amount_to_sell = (wallet.get_balance(symbol) * 0.5)  # Sell 50% of holdings
                 if amount_to_sell > 0:  # Prevent zero/negative trades
-                    wallet.update_balance(symbol, amount_to_sell, "SELL", price)
-                    self.record_trade("Moving Average", "SELL", symbol, amount_to_sell, price,
+                    fill_price = self.model.get_fill_price(symbol, "SELL", amount_to_sell, price)
+                    wallet.update_balance(symbol, amount_to_sell, "SELL", fill_price)
+                    self.record_trade("Moving Average", "SELL", symbol, amount_to_sell, fill_price,
                                       wallet.get_balance("USD"), wallet.get_balance(symbol))
                 else:
                     logger.warning(f"Skipping SELL for {symbol} due to insufficient calculated amount to sell.")
@@ -86,3 +92,14 @@ class MovingAverage:
 
         logger.debug(f"Short MA: {short_ma}, Long MA: {long_ma}")
         return short_ma, long_ma
+
+    def seed(self, prices):
+        """
+        Fill both windows from historical prices (oldest first) in one step,
+        replacing the current state.
+        """
+        self.short_ma = deque(prices[-self.short_window:], maxlen=self.short_window)
+        self.long_ma = deque(prices[-self.long_window:], maxlen=self.long_window)
+        self.short_sum = sum(self.short_ma)
+        self.long_sum = sum(self.long_ma)
+        logger.debug(f"Seeded moving averages with {len(self.long_ma)} historical prices.")
@@ -25,8 +25,9 @@ class PercentageBasedStrategy(TradingStrategy):
             sell_threshold = last_buy_price * (1 + self.profit_margin)
             if current_price >= sell_threshold and wallet.get_balance(symbol) > 0:
                 amount_to_sell = wallet.get_balance(symbol) * 0.5  # Sell 50%
-                wallet.update_balance(symbol, amount_to_sell, "SELL", current_price)
-                self.record_trade("Percentage Based", "SELL", symbol, amount_to_sell, current_price,
+                fill_price = self.model.get_fill_price(symbol, "SELL", amount_to_sell, current_price)
+                wallet.update_balance(symbol, amount_to_sell, "SELL", fill_price)
+                self.record_trade("Percentage Based", "SELL", symbol, amount_to_sell, fill_price,
                                   wallet.get_balance("USD"), wallet.get_balance(symbol))
 
         # BUY Condition
@@ -34,6 +35,7 @@ class PercentageBasedStrategy(TradingStrategy):
             buy_threshold = last_sell_price * (1 - self.loss_margin)
             if current_price <= buy_threshold and wallet.get_balance("USD") > 0:
                 amount_to_buy = (wallet.get_balance("USD") * 0.5) / current_price
-                wallet.update_balance(symbol, amount_to_buy, "BUY", current_price)
-                self.record_trade("Percentage Based", "BUY", symbol, amount_to_buy, current_price,
+                fill_price = self.model.get_fill_price(symbol, "BUY", amount_to_buy, current_price)
+                wallet.update_balance(symbol, amount_to_buy, "BUY", fill_price)
+                self.record_trade("Percentage Based", "BUY", symbol, amount_to_buy, fill_price,
                                   wallet.get_balance("USD"), wallet.get_balance(symbol))
@@ -0,0 +1,200 @@
+import math
+import time
+
+
+class PositionStats:
+    __slots__ = ("quantity", "cost", "realized", "wins", "losses", "trades")
+
+    def __init__(self):
+        """Running position and PnL totals for one symbol, or one strategy on one symbol."""
+        self.quantity = 0.0
+        self.cost = 0.0  # Cost basis of the open quantity, average cost method
+        self.realized = 0.0
+        self.wins = 0
+        self.losses = 0
+        self.trades = 0
+
+    @property
+    def average_cost(self):
+        return self.cost / self.quantity if self.quantity > 0 else 0.0
+
+    def unrealized(self, price):
+        return self.quantity * price - self.cost if self.quantity > 0 else 0.0
+
+    def buy(self, amount, price):
+        self.quantity += amount
+        self.cost += amount * price
+        self.trades += 1
+
+    def sell(self, amount, price, fallback_cost=None):
+        """
+        Reduce the position and realize PnL against its own average cost.
+        :param fallback_cost: Cost per unit of any amount beyond the open quantity. Strategies share
+            one wallet, so a strategy may sell more than it bought itself; that part is valued at the
+            symbol-wide average cost. Defaults to the sale price, i.e. no PnL.
+        :return: The realized PnL of this sale.
+        """
+        closed = min(amount, self.quantity)
+        excess_cost = price if fallback_cost is None else fallback_cost
+        pnl = closed * (price - self.average_cost) + (amount - closed) * (price - excess_cost)
+        self.realized += pnl
+        self.trades += 1
+        if pnl > 0:
+            self.wins += 1
+        elif pnl < 0:
+            self.losses += 1
+
+        self.cost -= closed * self.average_cost
+        self.quantity -= closed
+        if self.quantity <= 1e-12:
+            self.quantity, self.cost = 0.0, 0.0
+        return pnl
+
+    def win_rate(self):
+        closed = self.wins + self.losses
+        return self.wins / closed if closed else 0.0
+
+
+class PerformanceTracker:
+    def __init__(self, initial_investment=0):
+        """
+        Incremental performance analytics. Every update is O(1): trades and ticks
+        adjust running totals, the trade list is never rescanned.
+        """
+        self.initial_investment = initial_investment
+        self.cash = initial_investment
+        self.symbols = {}  # symbol -> PositionStats
+        self.strategies = {}  # (strategy, symbol) -> PositionStats
+        self.last_prices = {}
+        self.market_value = 0.0
+
+        self.peak_equity = initial_investment
+        self.max_drawdown = 0.0
+
+        self.first_time = None
+        self.last_time = None
+        self.exposure_time = 0.0
+        self._open_positions = 0
+
+    @property
+    def equity(self):
+        return self.cash + self.market_value
+
+    def on_price(self, symbol, price, timestamp=None):
+        """
+        Mark `symbol` to the latest price.
+        Prices that are not finite and positive, e.g. the 0 of a failed fetch, are ignored.
+        """
+        if not (math.isfinite(price) and price > 0):
+            return
+        self._advance_clock(time.time() if timestamp is None else timestamp)
+
+        position = self.symbols.get(symbol)
+        if position is not None and position.quantity > 0:
+            self.market_value += position.quantity * (price - self.last_prices.get(symbol, price))
+        self.last_prices[symbol] = price
+        self._update_drawdown()
+
+    def on_trade(self, trade):
+        """Apply a TradeHistoryModel to positions, cash and PnL."""
+        self._advance_clock(trade.date.timestamp())
+
+        symbol, amount, price = trade.symbol, trade.amount, trade.price
+        position = self.symbols.get(symbol)
+        if position is None:
+            position = self.symbols[symbol] = PositionStats()
+        strategy = self.strategies.get((trade.strategy, symbol))
+        if strategy is None:
+            strategy = self.strategies[(trade.strategy, symbol)] = PositionStats()
+
+        was_open = position.quantity > 0
+        # Without a mark yet (e.g. when replaying stored trades) the trade price is the mark,
+        # so the next on_price moves the position's value from there
+        mark = self.last_prices.setdefault(symbol, price)
+
+        if trade.action.upper() == "BUY":
+            self.cash -= amount * price
+            self.market_value += amount * mark
+            position.buy(amount, price)
+            strategy.buy(amount, price)
+        elif trade.action.upper() == "SELL":
+            self.cash += amount * price
+            self.market_value -= min(amount, position.quantity) * mark
+            strategy.sell(amount, price, position.average_cost)
+            position.sell(amount, price)
+        else:
+            raise ValueError(f"Invalid trade action: {trade.action}")
+
+        is_open = position.quantity > 0
+        self._open_positions += int(is_open) - int(was_open)
+        self._update_drawdown()
+
+    def _advance_clock(self, timestamp):
+        if self.first_time is None:
+            self.first_time = timestamp
+        elif self._open_positions and timestamp > self.last_time:
+            self.exposure_time += timestamp - self.last_time
+        self.last_time = timestamp if self.last_time is None else max(self.last_time, timestamp)
+
+    def _update_drawdown(self):
+        equity = self.equity
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        elif self.peak_equity > 0:
+            drawdown = (self.peak_equity - equity) / self.peak_equity
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+
+    def realized_pnl(self, symbol=None, strategy=None):
+        return sum(stats.realized for stats in self._select(symbol, strategy))
+
+    def unrealized_pnl(self, symbol=None, strategy=None):
+        if strategy is None:
+            stats = self.symbols.items() if symbol is None else [(symbol, self.symbols.get(symbol))]
+        else:
+            stats = [
+                (key[1], value) for key, value in self.strategies.items()
+                if key[0] == strategy and (symbol is None or key[1] == symbol)
+            ]
+        return sum(
+            value.unrealized(self.last_prices.get(name, 0)) for name, value in stats if value is not None
+        )
+
+    def win_rate(self, symbol=None, strategy=None):
+        """Fraction of closing (SELL) trades with a positive realized PnL."""
+        wins = losses = 0
+        for stats in self._select(symbol, strategy):
+            wins += stats.wins
+            losses += stats.losses
+        return wins / (wins + losses) if wins + losses else 0.0
+
+    @property
+    def exposure(self):
+        """Fraction of the tracked time during which any position was open."""
+        if self.first_time is None or self.last_time == self.first_time:
+            return 0.0
+        return self.exposure_time / (self.last_time - self.first_time)
+
+    def _select(self, symbol, strategy):
+        """PositionStats to aggregate; per-strategy stats are used when a strategy is given."""
+        if strategy is None:
+            if symbol is None:
+                return list(self.symbols.values())
+            return [self.symbols[symbol]] if symbol in self.symbols else []
+        return [
+            stats for (name, stats_symbol), stats in self.strategies.items()
+            if name == strategy and (symbol is None or stats_symbol == symbol)
+        ]
+
+    def summary(self):
+        """Return a dictionary of headline numbers, e.g. for the UI or a backtest report."""
+        return {
+            "equity": self.equity,
+            "return": self.equity / self.initial_investment - 1 if self.initial_investment else 0.0,
+            "realized_pnl": self.realized_pnl(),
+            "unrealized_pnl": self.unrealized_pnl(),
+            "max_drawdown": self.max_drawdown,
+            "win_rate": self.win_rate(),
+            "exposure": self.exposure,
+            "cost_basis": {symbol: stats.cost for symbol, stats in self.symbols.items()},
+        }
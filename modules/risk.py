@@ -0,0 +1,189 @@
+from bisect import insort
+from collections import deque
+from itertools import count
+
+from config.logging_config import logger
+
+
+class TriggerIndex:
+    def __init__(self):
+        """
+        Price levels for one symbol, kept sorted so that a tick only visits the levels it crossed.
+        Both lists are ordered so that the next level to fire is at the end and can be popped.
+        """
+        self._below = []  # (level, order id) ascending, fires when the price falls to the level
+        self._above = []  # (-level, order id) ascending, fires when the price rises to the level
+
+    def add_below(self, level, order_id):
+        insort(self._below, (level, order_id))
+
+    def add_above(self, level, order_id):
+        insort(self._above, (-level, order_id))
+
+    def pop_triggered(self, price):
+        """Remove and return the ids of every order whose level `price` reached, nearest level first."""
+        fired = []
+        while self._below and self._below[-1][0] >= price:
+            fired.append(self._below.pop()[1])
+        while self._above and self._above[-1][0] >= -price:
+            fired.append(self._above.pop()[1])
+        return fired
+
+    def retain(self, order_ids):
+        """Drop the levels of every order not in `order_ids`."""
+        self._below = [entry for entry in self._below if entry[1] in order_ids]
+        self._above = [entry for entry in self._above if entry[1] in order_ids]
+
+    def __len__(self):
+        return len(self._below) + len(self._above)
+
+
+class RiskOrder:
+    __slots__ = ("order_id", "symbol", "amount", "entry_price", "stop_price", "target_price", "strategy")
+
+    def __init__(self, order_id, symbol, amount, entry_price, stop_price, target_price, strategy):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.amount = amount
+        self.entry_price = entry_price
+        self.stop_price = stop_price
+        self.target_price = target_price
+        self.strategy = strategy
+
+    def __repr__(self):
+        return (f"RiskOrder({self.symbol} {self.amount:.6f} @ {self.entry_price:.2f}, "
+                f"stop: {self.stop_price}, target: {self.target_price})")
+
+
+class RiskManager:
+    STOP_LOSS_LABEL = "Stop Loss"
+    TAKE_PROFIT_LABEL = "Take Profit"
+
+    def __init__(self, model, record_trade_callback, stop_loss=0.05, take_profit=0.10):
+        """
+        Stop-loss and take-profit exits for every bought lot.
+        Levels live in a TriggerIndex per symbol, so the per-tick cost depends on the
+        orders that fire rather than on the number of open positions.
+        :param model: TradingBotModel whose wallet holds the positions.
+        :param record_trade_callback: Called for every exit, as for strategy trades.
+        :param stop_loss: Sell a lot once the price falls this fraction below its entry, None to disable.
+        :param take_profit: Sell a lot once the price rises this fraction above its entry, None to disable.
+        """
+        self.model = model
+        self.record_trade = record_trade_callback
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self._ids = count(1)
+        self._orders = {}  # order id -> RiskOrder
+        self._indexes = {}  # symbol -> TriggerIndex
+        self._lots = {}  # symbol -> order ids, oldest first, for matching strategy sells
+        self._dead = {}  # symbol -> levels still indexed for orders that are already closed
+
+    @property
+    def open_orders(self):
+        return list(self._orders.values())
+
+    def add_order(self, symbol, amount, entry_price, stop_price=None, target_price=None, strategy=None):
+        """
+        Protect `amount` of `symbol` with explicit levels.
+        :return: The order id, for `cancel`.
+        """
+        order_id = next(self._ids)
+        order = RiskOrder(order_id, symbol, amount, entry_price, stop_price, target_price, strategy)
+        index = self._indexes.setdefault(symbol, TriggerIndex())
+        if stop_price is not None:
+            index.add_below(stop_price, order_id)
+        if target_price is not None:
+            index.add_above(target_price, order_id)
+        self._orders[order_id] = order
+        self._lots.setdefault(symbol, deque()).append(order_id)
+        return order_id
+
+    def cancel(self, order_id):
+        order = self._orders.pop(order_id, None)
+        if order is not None:
+            self._dead[order.symbol] = self._dead.get(order.symbol, 0) + self._levels(order)
+            self._compact(order.symbol)
+
+    def on_trade(self, trade):
+        """
+        Track positions from recorded trades: a BUY opens a protected lot, a strategy SELL
+        reduces the oldest lots, and the manager's own exits are ignored.
+        """
+        if trade.strategy in (self.STOP_LOSS_LABEL, self.TAKE_PROFIT_LABEL):
+            return
+        if trade.action == "BUY":
+            self.add_order(
+                trade.symbol,
+                trade.amount,
+                trade.price,
+                stop_price=trade.price * (1 - self.stop_loss) if self.stop_loss is not None else None,
+                target_price=trade.price * (1 + self.take_profit) if self.take_profit is not None else None,
+                strategy=trade.strategy,
+            )
+        elif trade.action == "SELL":
+            self._reduce_lots(trade.symbol, trade.amount)
+
+    def on_price(self, symbol, price):
+        """Sell every lot whose stop or target `price` reached since the previous tick."""
+        index = self._indexes.get(symbol)
+        if not index or price <= 0:
+            return
+
+        for order_id in index.pop_triggered(price):
+            order = self._orders.pop(order_id, None)
+            if order is None:
+                # The other level of an order that already closed
+                self._dead[symbol] -= 1
+                continue
+            self._dead[symbol] = self._dead.get(symbol, 0) + self._levels(order) - 1
+            hit_stop = order.stop_price is not None and price <= order.stop_price
+            self._exit(order, price, self.STOP_LOSS_LABEL if hit_stop else self.TAKE_PROFIT_LABEL)
+        self._compact(symbol)
+
+    def _exit(self, order, price, label):
+        wallet = self.model.wallet
+        amount = min(order.amount, wallet.get_balance(order.symbol))
+        if amount <= 0:
+            return
+        fill_price = self.model.get_fill_price(order.symbol, "SELL", amount, price)
+        try:
+            wallet.update_balance(order.symbol, amount, "SELL", fill_price)
+        except ValueError as e:
+            logger.warning(f"Skipping {label} exit for {order}: {e}")
+            return
+        logger.info(f"{label} triggered for {order} at ${price:.2f}.")
+        self.record_trade(label, "SELL", order.symbol, amount, fill_price,
+                          wallet.get_balance("USD"), wallet.get_balance(order.symbol))
+
+    def _reduce_lots(self, symbol, amount):
+        lots = self._lots.get(symbol)
+        while lots and amount > 0:
+            order = self._orders.get(lots[0])
+            if order is None:
+                lots.popleft()
+                continue
+            if order.amount > amount:
+                order.amount -= amount
+                break
+            amount -= order.amount
+            lots.popleft()
+            del self._orders[order.order_id]
+            self._dead[symbol] = self._dead.get(symbol, 0) + self._levels(order)
+        self._compact(symbol)
+
+    @staticmethod
+    def _levels(order):
+        return (order.stop_price is not None) + (order.target_price is not None)
+
+    def _compact(self, symbol):
+        """
+        Closed orders leave their remaining levels in the index, where they are skipped
+        when they fire. Rebuild the index once those make up more than half of it.
+        """
+        index = self._indexes.get(symbol)
+        if index is None or self._dead.get(symbol, 0) * 2 <= len(index):
+            return
+        index.retain(self._orders)
+        self._lots[symbol] = deque(order_id for order_id in self._lots.get(symbol, ()) if order_id in self._orders)
+        self._dead[symbol] = 0
@@ -0,0 +1,308 @@
+import re
+from collections import deque
+
+from config.logging_config import logger
+from modules.trading_utils import TradingStrategy
+
+# Rule format, one rule per string:
+#
+#     <clause> [and <clause> ...] -> buy <N>% usd
+#     <clause> [and <clause> ...] -> sell <N>% position
+#
+# A clause compares two operands with >, <, >=, <=, "crosses above" or
+# "crosses below". Operands are sma(<window>), price, usd (USD balance),
+# position (balance of the evaluated symbol) or a number, e.g.
+#
+#     sma(5) crosses above sma(20) and usd > 100 -> buy 50% usd
+
+TOKEN_PATTERN = re.compile(r"\s*(?:(\d+(?:\.\d+)?)|([A-Za-z_]+)|(>=|<=|->|→|[<>(),%]))")
+COMPARATORS = (">", "<", ">=", "<=", "crosses above", "crosses below")
+FIELDS = ("price", "usd", "position")
+WALLET_FIELDS = ("usd", "position")
+
+
+class RuleSyntaxError(ValueError):
+    """Raised when a rule string cannot be parsed."""
+
+
+class Operand:
+    __slots__ = ("kind", "value")
+
+    def __init__(self, kind, value=None):
+        """
+        :param kind: "sma", "field" or "number".
+        :param value: Window for "sma", field name for "field", constant for "number".
+        """
+        self.kind = kind
+        self.value = value
+
+    @property
+    def key(self):
+        return (self.kind, self.value)
+
+    @property
+    def uses_wallet(self):
+        return self.kind == "field" and self.value in WALLET_FIELDS
+
+    def __repr__(self):
+        if self.kind == "sma":
+            return f"sma({self.value})"
+        return str(self.value)
+
+
+class Clause:
+    __slots__ = ("left", "comparator", "right")
+
+    def __init__(self, left, comparator, right):
+        self.left = left
+        self.comparator = comparator
+        self.right = right
+
+    @property
+    def uses_wallet(self):
+        return self.left.uses_wallet or self.right.uses_wallet
+
+    def __repr__(self):
+        return f"{self.left} {self.comparator} {self.right}"
+
+
+class Rule:
+    __slots__ = ("text", "clauses", "action", "fraction")
+
+    def __init__(self, text, clauses, action, fraction):
+        """
+        A parsed rule.
+        :param action: "BUY" (spend `fraction` of USD) or "SELL" (sell `fraction` of the position).
+        :param fraction: Share of the balance to trade, e.g. 0.5.
+        """
+        self.text = text
+        self.clauses = clauses
+        self.action = action
+        self.fraction = fraction
+
+    @property
+    def sma_windows(self):
+        return sorted({
+            operand.value
+            for clause in self.clauses
+            for operand in (clause.left, clause.right)
+            if operand.kind == "sma"
+        })
+
+    def __repr__(self):
+        return f"Rule({self.text!r})"
+
+
+def _tokenize(text):
+    tokens, position = [], 0
+    text = text.strip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise RuleSyntaxError(f"Unexpected character at position {position} in rule: {text!r}")
+        number, word, symbol = match.groups()
+        if number is not None:
+            tokens.append(("number", float(number)))
+        elif word is not None:
+            tokens.append(("word", word.lower()))
+        elif symbol is not None:
+            tokens.append(("symbol", "->" if symbol == "→" else symbol))
+        position = match.end()
+    return tokens
+
+
+def parse_rule(text):
+    """
+    Parse a rule string into a Rule.
+    :raises RuleSyntaxError: If the rule does not follow the format above.
+    """
+    tokens = _tokenize(text)
+    position = 0
+
+    def peek(offset=0):
+        index = position + offset
+        return tokens[index] if index < len(tokens) else (None, None)
+
+    def take(kind=None, value=None):
+        nonlocal position
+        token = peek()
+        if token[0] is None or (kind and token[0] != kind) or (value is not None and token[1] != value):
+            expected = value if value is not None else kind
+            raise RuleSyntaxError(f"Expected {expected!r} but found {token[1]!r} in rule: {text!r}")
+        position += 1
+        return token[1]
+
+    def operand():
+        kind, value = peek()
+        if kind == "number":
+            return Operand("number", take())
+        if kind == "word" and value == "sma":
+            take()
+            take("symbol", "(")
+            window = take("number")
+            take("symbol", ")")
+            if window < 1 or window != int(window):
+                raise RuleSyntaxError(f"sma window must be a positive integer in rule: {text!r}")
+            return Operand("sma", int(window))
+        if kind == "word" and value in FIELDS:
+            return Operand("field", take())
+        raise RuleSyntaxError(f"Expected an operand but found {value!r} in rule: {text!r}")
+
+    def comparator():
+        kind, value = peek()
+        if kind == "word" and value == "crosses":
+            take()
+            direction = take("word")
+            if direction not in ("above", "below"):
+                raise RuleSyntaxError(f"Expected 'above' or 'below' after 'crosses' in rule: {text!r}")
+            return f"crosses {direction}"
+        if kind == "symbol" and value in COMPARATORS:
+            return take()
+        raise RuleSyntaxError(f"Expected a comparator but found {value!r} in rule: {text!r}")
+
+    clauses = []
+    while True:
+        left = operand()
+        comparison = comparator()
+        right = operand()
+        if comparison.startswith("crosses") and (left.uses_wallet or right.uses_wallet):
+            raise RuleSyntaxError(f"'crosses' can only compare price-based operands in rule: {text!r}")
+        clauses.append(Clause(left, comparison, right))
+        if peek() == ("word", "and"):
+            take()
+            continue
+        break
+
+    if peek() == ("word", "then"):
+        take()
+    else:
+        take("symbol", "->")
+
+    action = take("word")
+    if action not in ("buy", "sell"):
+        raise RuleSyntaxError(f"Action must be 'buy' or 'sell' in rule: {text!r}")
+    percent = take("number")
+    take("symbol", "%")
+    target = take("word")
+    if action == "buy" and target != "usd":
+        raise RuleSyntaxError(f"'buy' must spend a percentage of 'usd' in rule: {text!r}")
+    if action == "sell" and target not in ("position", "holdings"):
+        raise RuleSyntaxError(f"'sell' must sell a percentage of 'position' in rule: {text!r}")
+    if not 0 < percent <= 100:
+        raise RuleSyntaxError(f"Percentage must be in (0, 100] in rule: {text!r}")
+    if position != len(tokens):
+        raise RuleSyntaxError(f"Unexpected {peek()[1]!r} at the end of rule: {text!r}")
+
+    return Rule(text, clauses, action.upper(), percent / 100)
+
+
+def compare(comparator, left, right, previous_left=None, previous_right=None):
+    """Evaluate one comparison; any missing value (indicator not warmed up yet) is False."""
+    if left is None or right is None:
+        return False
+    if comparator == ">":
+        return left > right
+    if comparator == "<":
+        return left < right
+    if comparator == ">=":
+        return left >= right
+    if comparator == "<=":
+        return left <= right
+    if previous_left is None or previous_right is None:
+        return False
+    if comparator == "crosses above":
+        return previous_left <= previous_right and left > right
+    return previous_left >= previous_right and left < right
+
+
+class RollingMean:
+    def __init__(self, window):
+        """Incremental simple moving average, None until `window` prices were added."""
+        self.window = window
+        self.total = 0.0
+        self.values = deque(maxlen=window)
+
+    def update(self, price):
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(price)
+        self.total += price
+        return self.total / self.window if len(self.values) == self.window else None
+
+
+class RuleStrategy(TradingStrategy):
+    def __init__(self, rules, model, record_trade_callback, label="Rules"):
+        """
+        Streaming evaluator for declarative rules, run by TradingBot like any other strategy.
+        :param rules: Rule strings or parsed Rule objects; evaluated in order on every tick.
+        :param label: Strategy name recorded with each trade.
+        """
+        self.rules = [rule if isinstance(rule, Rule) else parse_rule(rule) for rule in rules]
+        self.model = model
+        self.record_trade = record_trade_callback
+        self.label = label
+        self.windows = sorted({window for rule in self.rules for window in rule.sma_windows})
+        self._indicators = {}  # symbol -> {window: RollingMean}
+        self._previous = {}  # symbol -> operand values on the previous tick
+
+    def warm_up(self, symbol, prices):
+        # Only the longest window matters; the last value also becomes the "previous" for crossings
+        indicators = self._indicators[symbol] = {window: RollingMean(window) for window in self.windows}
+        values = {}
+        for price in prices[-(max(self.windows, default=0) + 1):]:
+            values = self._update_indicators(indicators, price)
+        self._previous[symbol] = values
+
+    def _update_indicators(self, indicators, price):
+        values = {("sma", window): indicator.update(price) for window, indicator in indicators.items()}
+        values[("field", "price")] = price
+        return values
+
+    def evaluate(self, symbol, price):
+        if price <= 0:
+            logger.warning(f"Skipping evaluation for {symbol} due to invalid price: {price}")
+            return
+
+        indicators = self._indicators.get(symbol)
+        if indicators is None:
+            indicators = self._indicators[symbol] = {window: RollingMean(window) for window in self.windows}
+        values = self._update_indicators(indicators, price)
+        previous = self._previous.get(symbol, {})
+
+        for rule in self.rules:
+            wallet = self.model.wallet
+            values[("field", "usd")] = wallet.get_balance("USD")
+            values[("field", "position")] = wallet.get_balance(symbol)
+            if all(self._check(clause, values, previous) for clause in rule.clauses):
+                self._execute(rule, symbol, price)
+
+        self._previous[symbol] = values
+
+    @staticmethod
+    def _check(clause, values, previous):
+        left = clause.left.value if clause.left.kind == "number" else values.get(clause.left.key)
+        right = clause.right.value if clause.right.kind == "number" else values.get(clause.right.key)
+        previous_left = clause.left.value if clause.left.kind == "number" else previous.get(clause.left.key)
+        previous_right = clause.right.value if clause.right.kind == "number" else previous.get(clause.right.key)
+        return compare(clause.comparator, left, right, previous_left, previous_right)
+
+    def _execute(self, rule, symbol, price):
+        wallet = self.model.wallet
+        if rule.action == "BUY":
+            amount = wallet.get_balance("USD") * rule.fraction / price
+        else:
+            amount = wallet.get_balance(symbol) * rule.fraction
+        if amount <= 0:
+            return
+
+        fill_price = self.model.get_fill_price(symbol, rule.action, amount, price)
+        if rule.action == "BUY":
+            # A worse fill must not spend more than the available USD
+            amount = min(amount, wallet.get_balance("USD") / fill_price)
+        try:
+            wallet.update_balance(symbol, amount, rule.action, fill_price)
+        except ValueError as e:
+            logger.warning(f"Skipping {rule.action} for {symbol} from rule {rule.text!r}: {e}")
+            return
+        self.record_trade(self.label, rule.action, symbol, amount, fill_price,
+                          wallet.get_balance("USD"), wallet.get_balance(symbol))
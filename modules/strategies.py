@@ -0,0 +1,73 @@
+from itertools import product
+
+from modules.moving_average import MovingAverageStrategy
+from modules.percentage_base import PercentageBasedStrategy
+from modules.rules import RuleStrategy
+
+# Strategies that can be described by plain data (a name and a dict of
+# parameters). This lets them be rebuilt inside worker processes or from saved
+# configurations, where passing a live strategy object is not possible.
+STRATEGIES = {
+    "moving_average": {
+        "class": MovingAverageStrategy,
+        "defaults": {"short_window": 5, "long_window": 20, "required_profit_percent": 10},
+        "grid": {
+            "short_window": [3, 5, 8],
+            "long_window": [10, 20, 30],
+            "required_profit_percent": [1, 5, 10],
+        },
+    },
+    "percentage_based": {
+        "class": PercentageBasedStrategy,
+        "defaults": {"profit_margin": 0.05, "loss_margin": 0.05},
+        "grid": {
+            "profit_margin": [0.005, 0.01, 0.02, 0.05],
+            "loss_margin": [0.005, 0.01, 0.02, 0.05],
+        },
+    },
+    "rules": {
+        "class": RuleStrategy,
+        "defaults": {
+            "rules": [
+                "sma(5) crosses above sma(20) and usd > 100 -> buy 50% usd",
+                "sma(5) crosses below sma(20) and position > 0 -> sell 50% position",
+            ],
+            "label": "Rules",
+        },
+        "grid": {},
+    },
+}
+
+
+def build_strategy(name, params, model, record_trade_callback):
+    """
+    Create a registered strategy by name.
+    :param name: Key in `STRATEGIES`, e.g. "moving_average".
+    :param params: Strategy parameters; missing ones fall back to the defaults.
+    :param model: The TradingBotModel the strategy trades against.
+    :param record_trade_callback: Callback used by the strategy to record trades.
+    """
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {name}")
+
+    spec = STRATEGIES[name]
+    kwargs = dict(spec["defaults"])
+    kwargs.update(params or {})
+    return spec["class"](model=model, record_trade_callback=record_trade_callback, **kwargs)
+
+
+def parameter_grid(name, grid=None):
+    """
+    Return every valid parameter combination for a strategy as a list of dicts.
+    :param name: Key in `STRATEGIES`.
+    :param grid: Optional mapping of parameter name to candidate values, replaces the default grid.
+    """
+    grid = grid or STRATEGIES[name]["grid"]
+    keys = sorted(grid)
+    combinations = [dict(zip(keys, values)) for values in product(*(grid[key] for key in keys))]
+
+    if name == "moving_average":
+        # A crossover needs the short window to be strictly shorter than the long one
+        combinations = [params for params in combinations if params["short_window"] < params["long_window"]]
+
+    return combinations
@@ -1,21 +1,41 @@
+import math
+import time
 from collections import deque
+
+from config.logging_config import logger
+from modules.aligned_prices import AlignedPriceView
+from modules.bars import BarBuilder
+from modules.performance import PerformanceTracker
 from modules.wallet import Wallet
+from utility.downsample import DownsampledSeries
 
 
 class TradingBotModel:
-    def __init__(self, initial_investment=2000, trade_interval=300, max_prices=10, callback=None):
+    def __init__(self, initial_investment=2000, trade_interval=300, max_prices=10, chart_points=500, callback=None):
         """
         A data model to track the state of the trading bot.
         """
         self._callback = callback
         self.wallet = Wallet(usd_balance=initial_investment)
         self.trade_interval = trade_interval
+        # Number of recent prices kept per symbol for the strategies
+        self.max_prices = max_prices
+        # Optional execution model (e.g. DepthExecutionModel) used to estimate fill prices
+        self.execution_model = None
         # Price history
         self._btc_prices = deque(maxlen=max_prices)
         self._eth_prices = deque(maxlen=max_prices)
+        # Long-horizon price history for charts, downsampled to at most `chart_points` per symbol
+        self._chart_series = {"BTC": DownsampledSeries(chart_points), "ETH": DownsampledSeries(chart_points)}
+        # OHLCV bars over longer horizons than the raw price window
+        self.bars = BarBuilder()
+        # BTC and ETH prices joined on time for cross-asset strategies; a missed poll or two is forward-filled
+        self.aligned = AlignedPriceView(("BTC", "ETH"), max_staleness=trade_interval * 3, capacity=chart_points)
 
         # Trade history
         self._trade_history = []
+        # Running PnL, drawdown and win rate, updated on every trade and price
+        self.performance = PerformanceTracker(initial_investment)
 
         # Latest prices
 
@@ -24,9 +44,14 @@ class TradingBotModel:
         """Return combined trade history."""
         return sorted(self._trade_history, key=lambda trade: trade.date, reverse=True)
 
+    def iter_trades(self):
+        """Iterate over trades in the order they were made, without copying or sorting the history."""
+        return iter(self._trade_history)
+
     def add_trade(self, trade):
         """Add a trade to history."""
         self._trade_history.append(trade)
+        self.performance.on_trade(trade)
         self._trigger_callback()
 
     @property
@@ -57,9 +82,18 @@ class TradingBotModel:
     @property
     def total_balance(self):
         """Calculate the total balance in USD."""
-        btc_value = self.btc_balance * self.btc_price
-        eth_value = self.eth_balance * self.eth_price
-        usd_value = self.usd_balance
+        return self.get_total_balance()
+
+    def get_total_balance(self, snapshot=None):
+        """
+        Calculate the total balance in USD from a single wallet snapshot, so a
+        trade applied concurrently cannot be counted half.
+        :param snapshot: WalletSnapshot to value, defaults to the current one.
+        """
+        snapshot = snapshot or self.wallet.snapshot()
+        btc_value = snapshot.get_balance("BTC") * self.btc_price
+        eth_value = snapshot.get_balance("ETH") * self.eth_price
+        usd_value = snapshot.get_balance("USD")
         return btc_value + eth_value + usd_value
 
     def get_prices(self, symbol):
@@ -69,6 +103,10 @@ class TradingBotModel:
         elif symbol == "ETH":
             return list(self._eth_prices)
 
+    def get_chart_series(self, symbol):
+        """Get the downsampled long-horizon price series for a symbol."""
+        return self._chart_series.get(symbol)
+
     def add_btc_price(self, price):
         """Add a new BTC price to the price history."""
         self._btc_prices.append(price)
@@ -79,6 +117,57 @@ class TradingBotModel:
         self._eth_prices.append(price)
         self._trigger_callback()
 
+    def add_price(self, symbol, price, timestamp=None):
+        """
+        Add a new price for the given symbol to its price history and bars.
+        Prices that are not finite and positive (a failed fetch reports 0) are skipped, so they
+        never reach the strategies' history, the bars, the charts or the performance tracker.
+        :param timestamp: Tick time in seconds since the epoch, defaults to now.
+        :return: True if the price was added.
+        """
+        if not (math.isfinite(price) and price > 0):
+            logger.warning(f"Ignoring invalid {symbol} price: {price}")
+            return False
+        if symbol == "BTC":
+            self.add_btc_price(price)
+        elif symbol == "ETH":
+            self.add_eth_price(price)
+        else:
+            raise ValueError(f"Unsupported symbol: {symbol}")
+        timestamp = time.time() if timestamp is None else timestamp
+        self._chart_series[symbol].append(timestamp, price)
+        self.bars.update(symbol, price, timestamp)
+        self.aligned.update(symbol, price, timestamp)
+        self.performance.on_price(symbol, price, timestamp)
+        return True
+
+    def seed_prices(self, symbol, history):
+        """
+        Bulk-load historical prices without notifying observers per price.
+        :param history: List of (timestamp in seconds, price) pairs, oldest first.
+        """
+        if symbol == "BTC":
+            self._btc_prices.extend(price for _, price in history)
+        elif symbol == "ETH":
+            self._eth_prices.extend(price for _, price in history)
+        else:
+            raise ValueError(f"Unsupported symbol: {symbol}")
+
+        series = self._chart_series[symbol]
+        for timestamp, price in history:
+            series.append(timestamp, price)
+        self.bars.load_history(symbol, [(timestamp * 1000, price) for timestamp, price in history])
+        self._trigger_callback()
+
+    def get_fill_price(self, symbol, action, amount, price):
+        """
+        Estimate the price a simulated order would fill at.
+        Falls back to the given mid price when no execution model is set.
+        """
+        if self.execution_model is None:
+            return price
+        return self.execution_model.fill_price(symbol, action, amount, price)
+
     def get_last_trade_price(self, symbol, action):
         """
         Get the price of the last trade for the given symbol and action (BUY or SELL).
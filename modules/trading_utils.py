@@ -79,8 +79,12 @@ def fetch_account_balance(api_client):
 
 
 # Fetch best bid and ask prices
-def get_best_bid_ask(api_client, symbol: str):
-    """Fetch and return best bid and ask prices for a trading pair."""
+def get_best_bid_ask(api_client, symbol: str, on_quote=None):
+    """
+    Fetch and return best bid and ask prices for a trading pair.
+    :param on_quote: Optional `on_quote(symbol, bid, ask, api_timestamp)` called with every raw quote,
+        e.g. TickRecorder.record.
+    """
     logger.info(f"Fetching best bid and ask for {symbol}...")
     try:
         # Fetch data from API
@@ -97,6 +101,8 @@ def get_best_bid_ask(api_client, symbol: str):
         # Validate bid and ask values
         best_bid = float(result.get('bid_inclusive_of_sell_spread', 0))
         best_ask = float(result.get('ask_inclusive_of_buy_spread', 0))
+        if on_quote and result:
+            on_quote(result.get("symbol", symbol), best_bid, best_ask, result.get("timestamp"))
 
         if best_bid > 0 and best_ask > 0:
             logger.debug(f"Best Bid: {best_bid:.2f}, Best Ask: {best_ask:.2f} for {symbol}")
@@ -113,6 +119,38 @@ def get_best_bid_ask(api_client, symbol: str):
     return 0, 0
 
 
+# Fetch best bid and ask prices for several pairs in one request
+def get_best_bid_ask_batch(api_client, symbols, on_quote=None):
+    """
+    Fetch best bid and ask prices for several trading pairs with a single API call.
+    :param on_quote: Optional `on_quote(symbol, bid, ask, api_timestamp)` called with every raw quote.
+    :return: Dictionary of trading pair to (bid, ask); pairs without valid prices are left out.
+    """
+    logger.info(f"Fetching best bid and ask for {', '.join(symbols)}...")
+    quotes = {}
+    try:
+        price_data = api_client.get_best_bid_ask(*symbols)
+        if not price_data or "results" not in price_data:
+            logger.warning(f"No valid results found for {symbols}. Response: {price_data}")
+            return quotes
+
+        for result in price_data["results"]:
+            symbol = result.get("symbol")
+            best_bid = float(result.get('bid_inclusive_of_sell_spread', 0))
+            best_ask = float(result.get('ask_inclusive_of_buy_spread', 0))
+            if on_quote and symbol:
+                on_quote(symbol, best_bid, best_ask, result.get("timestamp"))
+            if symbol in symbols and best_bid > 0 and best_ask > 0:
+                quotes[symbol] = (best_bid, best_ask)
+            else:
+                logger.warning(f"Invalid prices for {symbol}: Bid={best_bid}, Ask={best_ask}")
+    except ValueError as e:
+        logger.error(f"ValueError converting bid/ask to float for {symbols}: {e}", exc_info=True)
+    except Exception as e:
+        logger.error(f"Unexpected error fetching best bid and ask for {symbols}: {e}", exc_info=True)
+    return quotes
+
+
 # Fetch trading pairs
 def fetch_trading_pairs(api_client):
     """Fetch and print trading pairs available on Robinhood."""
@@ -141,4 +179,11 @@ class TradingStrategy(ABC):
         """
         Evaluate trading opportunities based on the strategy.
         """
+        pass
+
+    def warm_up(self, symbol, prices):
+        """
+        Seed indicator state from historical prices (oldest first) so the strategy
+        can act on the first live tick. Strategies without state need not override it.
+        """
         pass
\ No newline at end of file
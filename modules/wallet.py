@@ -1,31 +1,70 @@
+from threading import Lock
+from types import MappingProxyType
+
+
+class WalletSnapshot:
+    __slots__ = ("balances", "version")
+
+    def __init__(self, balances, version):
+        """
+        An immutable view of every balance at one point in time.
+        `version` increases by one with every applied update.
+        """
+        self.balances = MappingProxyType(balances)
+        self.version = version
+
+    def get_balance(self, symbol):
+        return self.balances.get(symbol, 0)
 
 
 class Wallet:
     def __init__(self, usd_balance=0):
-        self.balances = {"USD": usd_balance, "BTC": 0, "ETH": 0}
+        # Updates build a new snapshot under the lock and publish it with a single
+        # reference assignment, so readers (e.g. the UI thread) never lock and
+        # never see a half-applied trade.
+        self._lock = Lock()
+        self._snapshot = WalletSnapshot({"USD": usd_balance, "BTC": 0, "ETH": 0}, 0)
+
+    @property
+    def balances(self):
+        """Read-only mapping of the current balances."""
+        return self._snapshot.balances
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def snapshot(self):
+        """Return the current WalletSnapshot; read several balances from it to get consistent values."""
+        return self._snapshot
 
     def get_balance(self, symbol):
-        return self.balances.get(symbol, 0)
+        return self._snapshot.get_balance(symbol)
 
     def has_sufficient_balance(self, symbol, amount, action, price):
+        balances = self._snapshot.balances
         if action == "BUY":
-            return self.balances["USD"] >= amount * price
+            return balances["USD"] >= amount * price
         elif action == "SELL":
-            return self.balances[symbol] >= amount
+            return balances[symbol] >= amount
         return False
 
     def update_balance(self, symbol, amount, action, price):
-        if action == "BUY":
-            if self.balances["USD"] >= amount * price:
-                self.balances["USD"] -= amount * price
-                self.balances[symbol] += amount
+        with self._lock:
+            current = self._snapshot
+            balances = dict(current.balances)
+            if action == "BUY":
+                if balances["USD"] >= amount * price:
+                    balances["USD"] -= amount * price
+                    balances[symbol] += amount
+                else:
+                    raise ValueError(f"Insufficient USD balance for BUY {symbol}.")
+            elif action == "SELL":
+                if balances[symbol] >= amount:
+                    balances["USD"] += amount * price
+                    balances[symbol] -= amount
+                else:
+                    raise ValueError(f"Insufficient {symbol} balance for SELL.")
             else:
-                raise ValueError(f"Insufficient USD balance for BUY {symbol}.")
-        elif action == "SELL":
-            if self.balances[symbol] >= amount:
-                self.balances["USD"] += amount * price
-                self.balances[symbol] -= amount
-            else:
-                raise ValueError(f"Insufficient {symbol} balance for SELL.")
-
-
+                return
+            self._snapshot = WalletSnapshot(balances, current.version + 1)
@@ -0,0 +1,77 @@
+import queue
+import threading
+import time
+
+from config.logging_config import logger
+
+_STOP = object()
+
+
+class BatchingWriter:
+    def __init__(self, write_batch, batch_size=500, flush_interval=1.0, on_close=None, name=None):
+        """
+        Queue items from any thread and hand them to `write_batch` in batches from one
+        background thread, so producers never wait for the disk.
+        :param write_batch: Called on the writer thread with a non-empty list of queued items.
+        :param batch_size: Maximum items per batch.
+        :param flush_interval: Seconds the writer waits for more items before writing a partial batch.
+        :param on_close: Optional callable run on the writer thread after the last batch, e.g. to close files.
+        :param name: Name of the writer thread.
+        """
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_close = on_close
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, item):
+        self._queue.put(item)
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Write pending items and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _write_loop(self):
+        running = True
+        while running:
+            item = self._queue.get()
+            batch, waiters = [], []
+
+            # Collect whatever arrives within the flush interval, up to a full batch
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    running = False
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self.write_batch(batch)
+                except Exception as e:
+                    # Keep the thread alive so later batches and flush() callers are still served
+                    logger.error(f"Failed to write a batch of {len(batch)} items: {e}", exc_info=True)
+            for waiter in waiters:
+                waiter.set()
+
+        if self.on_close:
+            self.on_close()
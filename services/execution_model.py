@@ -0,0 +1,147 @@
+import time
+from bisect import bisect_left
+
+from config.logging_config import logger
+from modules.trading_utils import execute_trade
+
+# Order sizes sampled from the estimated price endpoint for each asset. They
+# should span the sizes the strategies actually trade.
+DEFAULT_QUANTITIES = {
+    "BTC": (0.0001, 0.001, 0.01, 0.1, 1),
+    "ETH": (0.001, 0.01, 0.1, 1, 10),
+}
+
+
+class PriceCurve:
+    def __init__(self, quantities, buy_premiums, sell_premiums, fetched_at):
+        """
+        Sampled price-vs-quantity curve for one trading pair.
+        Premiums are stored relative to the mid price at sampling time, so the
+        curve can be applied to whatever mid price the strategy sees later.
+        """
+        self.quantities = quantities
+        self.buy_premiums = buy_premiums
+        self.sell_premiums = sell_premiums
+        self.fetched_at = fetched_at
+
+    def premium(self, action, quantity):
+        """Interpolate the premium over mid for an order of `quantity`."""
+        premiums = self.buy_premiums if action == "BUY" else self.sell_premiums
+        quantities = self.quantities
+
+        if quantity <= quantities[0] or len(quantities) == 1:
+            return premiums[0]
+
+        index = bisect_left(quantities, quantity)
+        if index == len(quantities):
+            # Larger than the biggest sample: extend the last segment, the book only gets thinner
+            index -= 1
+        low_q, high_q = quantities[index - 1], quantities[index]
+        low_p, high_p = premiums[index - 1], premiums[index]
+        premium = low_p + (high_p - low_p) * (quantity - low_q) / (high_q - low_q)
+
+        # Never let extrapolation report a better fill than the largest sample
+        if quantity > quantities[-1]:
+            premium = max(premium, premiums[-1]) if action == "BUY" else min(premium, premiums[-1])
+        return premium
+
+
+class DepthExecutionModel:
+    def __init__(self, api_client, quantities=None, ttl=30, fallback_slippage=0.002):
+        """
+        Estimate fill prices from cached `get_estimated_price` curves.
+        :param api_client: CryptoAPITrading instance.
+        :param quantities: Mapping of asset code to the order sizes to sample.
+        :param ttl: Seconds a sampled curve stays valid. It should cover at least one tick, or every
+            fill samples a fresh curve; the bots pass their trade interval.
+        :param fallback_slippage: Flat slippage used when no curve is available.
+        """
+        self.api_client = api_client
+        self.quantities = quantities or DEFAULT_QUANTITIES
+        self.ttl = ttl
+        self.fallback_slippage = fallback_slippage
+        self._curves = {}
+        self._last_attempt = {}
+
+    def fill_price(self, symbol, action, quantity, price):
+        """
+        Return the estimated average fill price for an order.
+        :param symbol: Asset code, e.g. "BTC".
+        :param action: "BUY" or "SELL".
+        :param quantity: Order size in units of the asset.
+        :param price: Current mid price the strategy is trading on.
+        """
+        if action not in ("BUY", "SELL"):
+            raise ValueError(f"Invalid order type: {action}")
+
+        curve = self.get_curve(symbol)
+        if curve is None:
+            return execute_trade(price, quantity, action, slippage=self.fallback_slippage)
+
+        adjusted_price = price * (1 + curve.premium(action, quantity))
+        logger.debug(
+            f"Estimated {action} fill for {quantity:.6f} {symbol}: Mid=${price:.2f}, Fill=${adjusted_price:.2f}"
+        )
+        return adjusted_price
+
+    def get_curve(self, symbol):
+        """Return the cached curve for `symbol`, sampling a new one once the TTL has expired."""
+        curve = self._curves.get(symbol)
+        now = time.monotonic()
+        if now - self._last_attempt.get(symbol, float("-inf")) < self.ttl:
+            # Either still fresh, or the last refresh failed recently and should not be retried yet
+            return curve
+
+        self._last_attempt[symbol] = now
+        refreshed = self.refresh(symbol)
+        # A stale curve is still a better estimate than a flat slippage
+        return refreshed or curve
+
+    def refresh(self, symbol):
+        """Sample every configured quantity for both sides in a single API call."""
+        quantities = sorted(self.quantities.get(symbol, ()))
+        if not quantities:
+            logger.warning(f"No sample quantities configured for {symbol}.")
+            return None
+
+        quantity_param = ",".join(f"{quantity:g}" for quantity in quantities)
+        response = self.api_client.get_estimated_price(f"{symbol}-USD", "both", quantity_param)
+        curve = self._parse_curve(symbol, quantities, response)
+        if curve is not None:
+            self._curves[symbol] = curve
+        return curve
+
+    @staticmethod
+    def _parse_curve(symbol, quantities, response):
+        if not response or "results" not in response:
+            logger.warning(f"No estimated price results for {symbol}. Response: {response}")
+            return None
+
+        asks, bids = {}, {}
+        try:
+            for result in response["results"]:
+                quantity = float(result["quantity"])
+                side = result.get("side")
+                if side == "ask":
+                    asks[quantity] = float(result.get("ask_inclusive_of_buy_spread", result["price"]))
+                elif side == "bid":
+                    bids[quantity] = float(result.get("bid_inclusive_of_sell_spread", result["price"]))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Malformed estimated price response for {symbol}: {e}. Response: {response}")
+            return None
+
+        sampled = [quantity for quantity in quantities if quantity in asks and quantity in bids]
+        if not sampled:
+            logger.warning(f"Estimated price response for {symbol} did not cover any sampled quantity.")
+            return None
+
+        mid = (asks[sampled[0]] + bids[sampled[0]]) / 2
+        if mid <= 0:
+            return None
+
+        return PriceCurve(
+            quantities=sampled,
+            buy_premiums=[asks[quantity] / mid - 1 for quantity in sampled],
+            sell_premiums=[bids[quantity] / mid - 1 for quantity in sampled],
+            fetched_at=time.monotonic(),
+        )
@@ -0,0 +1,219 @@
+import os
+
+from config.logging_config import logger
+
+TRADE_COLUMNS = ("time", "strategy", "action", "symbol", "amount", "price", "usd_balance", "symbol_balance")
+EQUITY_COLUMNS = ("time", "equity")
+STRING_COLUMNS = ("strategy", "action", "symbol")
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def pyarrow_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def trade_row(trade):
+    """Flatten a TradeHistoryModel into a row of TRADE_COLUMNS."""
+    return (trade.date.timestamp(), trade.strategy, trade.action, trade.symbol, trade.amount, trade.price,
+            trade.usd_balance, trade.symbol_balance)
+
+
+class ChunkedColumnWriter:
+    def __init__(self, path, columns, format="auto", chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Append rows and write them out column by column, one chunk at a time, so memory
+        stays bounded by `chunk_size` rows however long the run is.
+        :param path: Output path without extension. Arrow writes `<path>.arrows` (an IPC stream,
+            readable up to the last complete chunk even if the process dies); npz writes
+            `<path>/part-00000.npz`, `<path>/part-00001.npz`, ...
+        :param columns: Column names; those in STRING_COLUMNS are stored as strings, the rest as float64.
+        :param format: "arrow" (needs pyarrow), "npz" (needs NumPy) or "auto" for Arrow when available.
+        """
+        if format == "auto":
+            format = "arrow" if pyarrow_available() else "npz"
+        if format not in ("arrow", "npz"):
+            raise ValueError(f"Unsupported export format: {format}")
+        self.format = format
+        self.columns = tuple(columns)
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self._buffer = [[] for _ in self.columns]
+        self._parts = 0
+        self._writer = None
+
+        if format == "arrow":
+            self.path = f"{path}.arrows"
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        else:
+            self.path = path
+            os.makedirs(path, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, row):
+        for column, value in zip(self._buffer, row):
+            column.append(value)
+        if len(self._buffer[0]) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, rows):
+        """Append rows from any iterable; it is consumed lazily, one chunk at a time."""
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        """Write the buffered rows as one chunk."""
+        count = len(self._buffer[0])
+        if not count:
+            return
+        if self.format == "arrow":
+            self._write_arrow()
+        else:
+            self._write_npz()
+        self.rows_written += count
+        self._buffer = [[] for _ in self.columns]
+
+    def close(self):
+        self.flush()
+        if self.format == "arrow" and self._writer is None:
+            # No rows at all: still write the schema, so readers find a valid, empty stream
+            self._open_arrow()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _arrow_schema(self):
+        import pyarrow as pa
+
+        return pa.schema([
+            (name, pa.string() if name in STRING_COLUMNS else pa.float64()) for name in self.columns
+        ])
+
+    def _open_arrow(self):
+        import pyarrow as pa
+
+        self._writer = pa.ipc.new_stream(self.path, self._arrow_schema())
+
+    def _write_arrow(self):
+        import pyarrow as pa
+
+        schema = self._arrow_schema()
+        if self._writer is None:
+            self._open_arrow()
+        batch = pa.record_batch(
+            [pa.array(values, type=field.type) for values, field in zip(self._buffer, schema)], schema=schema
+        )
+        self._writer.write_batch(batch)
+
+    def _write_npz(self):
+        import numpy as np
+
+        arrays = {
+            name: np.asarray(values, dtype=str if name in STRING_COLUMNS else np.float64)
+            for name, values in zip(self.columns, self._buffer)
+        }
+        np.savez(os.path.join(self.path, f"part-{self._parts:05d}.npz"), **arrays)
+        self._parts += 1
+
+
+def read_chunks(path):
+    """
+    Yield the chunks written by ChunkedColumnWriter as dictionaries of column name to array,
+    for `<path>.arrows` or a directory of npz parts. Yields nothing for a missing or empty npz directory.
+    """
+    if path.endswith(".arrows") or os.path.isfile(f"{path}.arrows"):
+        import pyarrow as pa
+
+        with pa.ipc.open_stream(path if path.endswith(".arrows") else f"{path}.arrows") as reader:
+            for batch in reader:
+                yield {name: batch.column(name).to_numpy(zero_copy_only=False) for name in batch.schema.names}
+        return
+
+    if not os.path.isdir(path):
+        return
+
+    import numpy as np
+
+    for name in sorted(name for name in os.listdir(path) if name.endswith(".npz")):
+        with np.load(os.path.join(path, name)) as part:
+            yield {column: part[column] for column in part.files}
+
+
+class RunExporter:
+    def __init__(self, directory, format="auto", chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Stream a run's trades and per-tick equity to `<directory>/trades` and `<directory>/equity`
+        as they happen. Attach it to a TradingBot or pass it to Backtest.run.
+        """
+        self.directory = directory
+        self.trades = ChunkedColumnWriter(os.path.join(directory, "trades"), TRADE_COLUMNS, format, chunk_size)
+        self.equity = ChunkedColumnWriter(os.path.join(directory, "equity"), EQUITY_COLUMNS, format, chunk_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def on_trade(self, trade):
+        self.trades.append(trade_row(trade))
+
+    def on_equity(self, timestamp, equity):
+        """
+        :param timestamp: Tick time in seconds since the epoch.
+        """
+        self.equity.append((timestamp, equity))
+
+    def flush(self):
+        self.trades.flush()
+        self.equity.flush()
+
+    def close(self):
+        self.trades.close()
+        self.equity.close()
+        logger.info(
+            f"Exported {self.trades.rows_written} trades and {self.equity.rows_written} equity points "
+            f"to {self.directory}."
+        )
+
+
+def export_trades(trades, path, format="auto", chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Export an iterable of TradeHistoryModel objects, e.g. `model.iter_trades()` or a backtest's trades.
+    :return: The written path.
+    """
+    with ChunkedColumnWriter(path, TRADE_COLUMNS, format, chunk_size) as writer:
+        writer.extend(trade_row(trade) for trade in trades)
+    return writer.path
+
+
+def export_equity(points, path, format="auto", chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Export (timestamp in seconds, equity) points from any iterable.
+    :return: The written path.
+    """
+    with ChunkedColumnWriter(path, EQUITY_COLUMNS, format, chunk_size) as writer:
+        writer.extend(points)
+    return writer.path
+
+
+def export_backtest(result, directory, format="auto", chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Export a BacktestResult's trades and equity curve.
+    :return: Dictionary with the "trades" and "equity" paths.
+    """
+    return {
+        "trades": export_trades(result.trades, os.path.join(directory, "trades"), format, chunk_size),
+        "equity": export_equity(
+            ((timestamp / 1000, equity) for timestamp, equity in result.equity),
+            os.path.join(directory, "equity"), format, chunk_size,
+        ),
+    }
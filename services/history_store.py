@@ -0,0 +1,223 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from config.logging_config import logger
+from modules.trade_history import TradeHistoryModel
+from services.batching_writer import BatchingWriter
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "history.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    strategy TEXT NOT NULL,
+    action TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    amount REAL NOT NULL,
+    price REAL NOT NULL,
+    usd_balance REAL NOT NULL,
+    symbol_balance REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trades_time ON trades (time);
+CREATE INDEX IF NOT EXISTS trades_symbol_time ON trades (symbol, time);
+CREATE INDEX IF NOT EXISTS trades_strategy_time ON trades (strategy, time);
+CREATE INDEX IF NOT EXISTS trades_action_time ON trades (action, time);
+
+CREATE TABLE IF NOT EXISTS ticks (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    symbol TEXT NOT NULL,
+    price REAL NOT NULL,
+    bid REAL,
+    ask REAL
+);
+CREATE INDEX IF NOT EXISTS ticks_symbol_time ON ticks (symbol, time);
+"""
+
+INSERT_TRADE = (
+    "INSERT INTO trades (time, strategy, action, symbol, amount, price, usd_balance, symbol_balance) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+INSERT_TICK = "INSERT INTO ticks (time, symbol, price, bid, ask) VALUES (?, ?, ?, ?, ?)"
+
+
+class Page:
+    def __init__(self, items, cursor):
+        """
+        One page of query results.
+        :param items: The rows of this page.
+        :param cursor: Pass back as `cursor` to fetch the next page, None on the last page.
+        """
+        self.items = items
+        self.cursor = cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class HistoryStore:
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=500, flush_interval=1.0):
+        """
+        SQLite store for trades and price ticks.
+        Writes are queued and inserted by a background thread in batched transactions,
+        so callers on the tick loop never wait for the disk.
+        :param path: Database file, created with its directory if missing. Must be a real file, since the
+            writer thread and readers use separate connections.
+        :param batch_size: Maximum rows inserted per transaction.
+        :param flush_interval: Seconds the writer waits for more rows before committing a partial batch.
+        """
+        self.path = path
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")  # Readers are not blocked by the writer
+        connection.executescript(SCHEMA)
+
+        # The writer thread opens its own connection on the first batch and closes it on close()
+        self._writer = BatchingWriter(self._commit, batch_size, flush_interval, on_close=self._close_connection,
+                                      name="history-store-writer")
+
+    def _connect(self):
+        """SQLite connections cannot be shared between threads, so each thread gets its own."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path)
+            self._local.connection = connection
+        return connection
+
+    # Writes
+
+    def record_trade(self, trade):
+        """Queue a TradeHistoryModel for insertion."""
+        self._writer.put((INSERT_TRADE, (
+            trade.date.timestamp(), trade.strategy, trade.action, trade.symbol, trade.amount, trade.price,
+            trade.usd_balance, trade.symbol_balance,
+        )))
+
+    def record_tick(self, symbol, price, timestamp=None, bid=None, ask=None):
+        """
+        Queue a price tick for insertion. Prices that are not finite and positive are not stored.
+        :param timestamp: Tick time in seconds since the epoch, defaults to now.
+        """
+        if not (math.isfinite(price) and price > 0):
+            logger.warning(f"Not storing invalid {symbol} tick: {price}")
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        self._writer.put((INSERT_TICK, (timestamp, symbol, price, bid, ask)))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been committed."""
+        return self._writer.flush(timeout)
+
+    def close(self):
+        """Commit pending writes and stop the writer thread."""
+        self._writer.close()
+
+    def _close_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _commit(self, batch):
+        connection = self._connect()
+        grouped = {}
+        for statement, row in batch:
+            grouped.setdefault(statement, []).append(row)
+        try:
+            with connection:
+                for statement, rows in grouped.items():
+                    connection.executemany(statement, rows)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write {len(batch)} rows to {self.path}: {e}", exc_info=True)
+
+    # Reads
+
+    def query_trades(self, symbol=None, strategy=None, action=None, start=None, end=None, limit=100,
+                     cursor=None):
+        """
+        Return a page of trades, newest first.
+        :param start: Only trades at or after this time (seconds since the epoch).
+        :param end: Only trades before this time (seconds since the epoch).
+        :param cursor: Cursor from the previous page.
+        :return: A Page of TradeHistoryModel objects.
+        """
+        clauses, params = self._filters(symbol=symbol, strategy=strategy, action=action, start=start, end=end)
+        if cursor is not None:
+            clauses.append("(time < ? OR (time = ? AND id < ?))")
+            params.extend([cursor[0], cursor[0], cursor[1]])
+
+        rows = self._connect().execute(
+            "SELECT id, time, strategy, action, symbol, amount, price, usd_balance, symbol_balance FROM trades"
+            f"{self._where(clauses)} ORDER BY time DESC, id DESC LIMIT ?",
+            params + [limit],
+        ).fetchall()
+
+        trades = [
+            TradeHistoryModel(
+                strategy=row[2], action=row[3], symbol=row[4], amount=row[5], price=row[6],
+                usd_balance=row[7], symbol_balance=row[8], date=datetime.fromtimestamp(row[1]),
+            )
+            for row in rows
+        ]
+        next_cursor = (rows[-1][1], rows[-1][0]) if len(rows) == limit else None
+        return Page(trades, next_cursor)
+
+    def query_ticks(self, symbol, start=None, end=None, limit=1000, cursor=None):
+        """
+        Return a page of ticks for `symbol`, oldest first.
+        :return: A Page of (timestamp, price, bid, ask) tuples.
+        """
+        clauses, params = self._filters(symbol=symbol, start=start, end=end)
+        if cursor is not None:
+            clauses.append("(time > ? OR (time = ? AND id > ?))")
+            params.extend([cursor[0], cursor[0], cursor[1]])
+
+        rows = self._connect().execute(
+            f"SELECT id, time, price, bid, ask FROM ticks{self._where(clauses)} ORDER BY time, id LIMIT ?",
+            params + [limit],
+        ).fetchall()
+
+        next_cursor = (rows[-1][1], rows[-1][0]) if len(rows) == limit else None
+        return Page([row[1:] for row in rows], next_cursor)
+
+    def latest_ticks(self, symbol, count):
+        """Return the newest `count` ticks for `symbol` as (timestamp, price, bid, ask), oldest first."""
+        rows = self._connect().execute(
+            "SELECT time, price, bid, ask FROM ticks WHERE symbol = ? ORDER BY time DESC, id DESC LIMIT ?",
+            (symbol, count),
+        ).fetchall()
+        rows.reverse()
+        return rows
+
+    def count_trades(self, symbol=None, strategy=None, action=None, start=None, end=None):
+        clauses, params = self._filters(symbol=symbol, strategy=strategy, action=action, start=start, end=end)
+        return self._connect().execute(f"SELECT COUNT(*) FROM trades{self._where(clauses)}", params).fetchone()[0]
+
+    @staticmethod
+    def _filters(symbol=None, strategy=None, action=None, start=None, end=None):
+        clauses, params = [], []
+        for column, value in (("symbol", symbol), ("strategy", strategy), ("action", action)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("time >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("time < ?")
+            params.append(end)
+        return clauses, params
+
+    @staticmethod
+    def _where(clauses):
+        return f" WHERE {' AND '.join(clauses)}" if clauses else ""
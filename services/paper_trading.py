@@ -0,0 +1,154 @@
+from threading import Event, Lock, Thread
+
+from config.logging_config import logger
+from modules.trading_bot_model import TradingBotModel
+from modules.trading_utils import get_best_bid_ask_batch
+from services.execution_model import DepthExecutionModel
+from services.robinhood_api_trading import CryptoAPITrading
+from services.scheduler import AdaptiveScheduler
+from services.trading_bot import TradingBot
+
+
+class MarketDataFeed:
+    def __init__(self, api_client=None, symbols=("BTC-USD", "ETH-USD"), interval=300, scheduler=None,
+                 recorder=None):
+        """
+        Poll prices for every trading pair with one request per tick and fan them out to subscribers.
+        :param api_client: Optional CryptoAPITrading client.
+        :param symbols: Trading pairs to poll, e.g. "BTC-USD".
+        :param interval: Base number of seconds between polls.
+        :param scheduler: Optional AdaptiveScheduler, defaults to one centred on `interval`.
+        :param recorder: Optional TickRecorder that logs every raw quote.
+        """
+        self.api_client = api_client or CryptoAPITrading()
+        self.symbols = tuple(symbols)
+        self.interval = interval
+        self.recorder = recorder
+        self.scheduler = scheduler or AdaptiveScheduler(
+            base_interval=interval, min_interval=interval / 5, max_interval=interval * 3, requests_per_tick=1,
+        )
+        self.is_running = False
+        self.thread = None
+        self._subscribers = []
+        self._lock = Lock()
+        self._stop_event = Event()
+
+    def subscribe(self, callback):
+        """Register `callback(prices)`, called with a dict of asset code to mid price on every tick."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers.remove(callback)
+
+    def poll(self):
+        """
+        Fetch the latest quotes once and publish the mid prices to every subscriber.
+        :return: Dictionary of asset code to mid price, empty if the request failed.
+        """
+        quotes = get_best_bid_ask_batch(self.api_client, self.symbols,
+                                        on_quote=self.recorder.record if self.recorder else None)
+        prices = {
+            symbol.split("-")[0]: (bid + ask) / 2
+            for symbol, (bid, ask) in quotes.items()
+        }
+        if not prices:
+            logger.warning("Market data feed received no valid prices, skipping tick.")
+            return prices
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(prices)
+            except Exception as e:
+                # One broken portfolio must not stop the others from receiving ticks
+                logger.error(f"Error in market data subscriber {callback}: {e}", exc_info=True)
+        return prices
+
+    def start(self):
+        """
+        Start polling in a separate thread.
+        :raises EnvironmentError: If the API credentials are missing.
+        """
+        if not self.is_running:
+            self.api_client.validate_credentials()
+            self.scheduler.reset()
+            self.is_running = True
+            self._stop_event.clear()
+            self.thread = Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """
+        Signal the feed to stop and wait for the polling thread.
+        """
+        self.is_running = False
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join()
+        if self.recorder:
+            self.recorder.flush()
+
+    def run(self):
+        logger.info(f"Starting market data feed for {', '.join(self.symbols)}...")
+        while self.is_running:
+            prices = self.poll()
+            self.scheduler.observe(prices)
+            if not self.scheduler.wait(self._stop_event):
+                break
+
+
+class PaperTradingSession:
+    def __init__(self, feed=None):
+        """
+        Run many independent paper portfolios off a single market data feed.
+        Each portfolio has its own TradingBotModel, Wallet and strategies, but
+        they share the feed, the API client and the execution model.
+        """
+        self.feed = feed or MarketDataFeed()
+        self.execution_model = DepthExecutionModel(self.feed.api_client, ttl=self.feed.interval)
+        self.portfolios = {}
+
+    def add_portfolio(self, name, strategies, initial_investment=2000):
+        """
+        Create a portfolio and subscribe it to the feed.
+        :param name: Unique name for the portfolio.
+        :param strategies: List of (name, params) pairs for `build_strategy`.
+        :param initial_investment: Starting USD balance.
+        :return: The TradingBot driving the portfolio.
+        """
+        if name in self.portfolios:
+            raise ValueError(f"Portfolio already exists: {name}")
+
+        model = TradingBotModel(initial_investment=initial_investment, trade_interval=self.feed.interval)
+        bot = TradingBot(
+            model,
+            api_client=self.feed.api_client,
+            strategies=strategies,
+            execution_model=self.execution_model,
+        )
+        bot.warm_start()
+        self.portfolios[name] = bot
+        self.feed.subscribe(bot.process_tick)
+        return bot
+
+    def remove_portfolio(self, name):
+        bot = self.portfolios.pop(name)
+        self.feed.unsubscribe(bot.process_tick)
+
+    def leaderboard(self):
+        """Return (name, total balance) for every portfolio, best first."""
+        return sorted(
+            ((name, bot.model.total_balance) for name, bot in self.portfolios.items()),
+            key=lambda entry: entry[1],
+            reverse=True,
+        )
+
+    def start(self):
+        self.feed.start()
+
+    def stop(self):
+        self.feed.stop()
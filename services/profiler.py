@@ -0,0 +1,251 @@
+import os
+import socketserver
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+from config.logging_config import logger
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles")
+DEFAULT_CONTROL_PORT = 8765
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def write_collapsed(path, stacks):
+    """Write a Counter of stack -> weight as collapsed stacks (`root;...;leaf weight`), the flamegraph input format."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode='w') as file:
+        for stack, weight in stacks.most_common():
+            file.write(f"{stack} {weight}\n")
+    return path
+
+
+class BotProfiler:
+    def __init__(self, output_dir=DEFAULT_PROFILE_DIR, sample_interval=0.005, memory_frames=25):
+        """
+        Runtime-toggleable profiling for a running TradingBot. Nothing is sampled or
+        traced until a profile is requested, and requests take effect on the next tick.
+        :param output_dir: Directory for the collapsed-stack files.
+        :param sample_interval: Seconds between CPU stack samples.
+        :param memory_frames: Traceback depth recorded by tracemalloc.
+        """
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.memory_frames = memory_frames
+        self._lock = threading.Lock()
+
+        self._cpu_remaining = 0
+        self._cpu_stacks = Counter()
+        self._sampler = None
+        self._sampling = threading.Event()
+        self._target_thread = None
+
+        self._memory_remaining = 0
+        self._memory_snapshot = None
+        self._memory_started_tracing = False
+
+        self.timers_enabled = False
+        self._timers = {}  # name -> [calls, total seconds, max seconds]
+
+    # Controls
+
+    def start_cpu_profile(self, iterations=10):
+        """Sample the bot thread's stacks during the next `iterations` ticks."""
+        with self._lock:
+            self._cpu_remaining = iterations
+            self._cpu_stacks = Counter()
+        logger.info(f"CPU profile armed for {iterations} iterations.")
+
+    def start_memory_profile(self, iterations=5):
+        """Diff tracemalloc snapshots across the next `iterations` ticks."""
+        with self._lock:
+            self._memory_remaining = iterations
+            self._memory_snapshot = None
+        logger.info(f"Memory profile armed for {iterations} iterations.")
+
+    def set_timers(self, enabled):
+        """Turn the per-strategy evaluate timers on or off; turning them on resets them."""
+        with self._lock:
+            if enabled and not self.timers_enabled:
+                self._timers = {}
+            self.timers_enabled = enabled
+
+    def timer_report(self):
+        """Return {name: (calls, total seconds, mean seconds, max seconds)}."""
+        with self._lock:
+            return {
+                name: (calls, total, total / calls if calls else 0.0, longest)
+                for name, (calls, total, longest) in self._timers.items()
+            }
+
+    def status(self):
+        return {
+            "cpu_iterations_left": self._cpu_remaining,
+            "memory_iterations_left": self._memory_remaining,
+            "timers_enabled": self.timers_enabled,
+        }
+
+    # Hooks called by the bot
+
+    @contextmanager
+    def time_strategy(self, name):
+        if not self.timers_enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                timer = self._timers.setdefault(name, [0, 0.0, 0.0])
+                timer[0] += 1
+                timer[1] += elapsed
+                timer[2] = max(timer[2], elapsed)
+
+    def on_tick_start(self):
+        if self._cpu_remaining > 0:
+            self._target_thread = threading.get_ident()
+            self._sampling.set()
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+                self._sampler.start()
+
+        if self._memory_remaining > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(self.memory_frames)
+            self._memory_started_tracing = True
+
+    def on_tick_end(self):
+        if self._cpu_remaining > 0:
+            self._sampling.clear()
+            with self._lock:
+                self._cpu_remaining -= 1
+                finished = self._cpu_remaining == 0
+            if finished:
+                self._write_cpu_profile()
+
+        if self._memory_remaining > 0 and tracemalloc.is_tracing():
+            self._record_memory()
+
+    # CPU sampling
+
+    def _sample_loop(self):
+        while self._cpu_remaining > 0:
+            if not self._sampling.wait(0.5):
+                continue
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                with self._lock:
+                    self._cpu_stacks[";".join(reversed(stack))] += 1
+            time.sleep(self.sample_interval)
+
+    def _write_cpu_profile(self):
+        with self._lock:
+            stacks, self._cpu_stacks = self._cpu_stacks, Counter()
+        path = os.path.join(self.output_dir, f"cpu-{time.strftime('%Y%m%d-%H%M%S')}.collapsed")
+        write_collapsed(path, stacks)
+        logger.info(f"CPU profile written to {path} ({sum(stacks.values())} samples).")
+
+    # Memory
+
+    def _record_memory(self):
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        previous, self._memory_snapshot = self._memory_snapshot, snapshot
+
+        if previous is not None:
+            growth = Counter()
+            for stat in snapshot.compare_to(previous, "traceback"):
+                if stat.size_diff > 0:
+                    stack = ";".join(
+                        f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in reversed(stat.traceback)
+                    )
+                    growth[stack] += stat.size_diff
+            path = os.path.join(
+                self.output_dir, f"mem-{time.strftime('%Y%m%d-%H%M%S')}-{self._memory_remaining}.collapsed"
+            )
+            write_collapsed(path, growth)
+            logger.info(f"Memory growth since the previous tick written to {path} ({sum(growth.values())} bytes).")
+
+            with self._lock:
+                self._memory_remaining -= 1
+                finished = self._memory_remaining == 0
+            if finished:
+                self._memory_snapshot = None
+                if self._memory_started_tracing:
+                    tracemalloc.stop()
+                    self._memory_started_tracing = False
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw_line in self.rfile:
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            if line in ("quit", "exit"):
+                break
+            self.wfile.write((self.server.execute(line) + "\n").encode("utf-8"))
+
+
+class ProfilerControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, profiler, port=DEFAULT_CONTROL_PORT):
+        """
+        Line-based control socket for a BotProfiler, bound to localhost only, e.g.
+        `nc 127.0.0.1 8765` then `cpu 20`, `mem 5`, `timers on`, `timers`, `status`.
+        The app opens it only when the PROFILER_PORT environment variable is set.
+        :raises OSError: If the port cannot be bound.
+        """
+        self.profiler = profiler
+        super().__init__(("127.0.0.1", port), _ControlHandler)
+        self._thread = None
+
+    def execute(self, line):
+        parts = line.split()
+        command, args = parts[0].lower(), parts[1:]
+        try:
+            if command == "cpu":
+                self.profiler.start_cpu_profile(int(args[0]) if args else 10)
+                return "ok"
+            if command == "mem":
+                self.profiler.start_memory_profile(int(args[0]) if args else 5)
+                return "ok"
+            if command == "timers" and args:
+                self.profiler.set_timers(args[0].lower() == "on")
+                return "ok"
+            if command == "timers":
+                report = self.profiler.timer_report()
+                return "\n".join(
+                    f"{name}: calls={calls} total={total:.6f}s mean={mean:.6f}s max={longest:.6f}s"
+                    for name, (calls, total, mean, longest) in report.items()
+                ) or "no timings recorded"
+            if command == "status":
+                return ", ".join(f"{key}={value}" for key, value in self.profiler.status().items())
+        except ValueError as e:
+            return f"error: {e}"
+        return "commands: cpu [N], mem [N], timers on|off, timers, status, quit"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Profiler control socket listening on 127.0.0.1:{self.server_address[1]}.")
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -1,30 +1,42 @@
 import base64
 import datetime
 import json
-import os
 from typing import Any, Dict, Optional
-import uuid
-import requests
-from dotenv import load_dotenv
-from nacl.signing import SigningKey
 
 from config.config import Config
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Access the variables
-API_KEY = Config.API_KEY
-PRIVATE_KEY = Config.PRIVATE_KEY
-
 
 class CryptoAPITrading:
     def __init__(self):
-        self.api_key = API_KEY
-        private_key_seed = base64.b64decode(PRIVATE_KEY)
-        self.private_key = SigningKey(private_key_seed)
+        # Credentials are read and the signing key decoded on the first request, so
+        # creating a client (e.g. for a backtest or paper portfolio) costs nothing
+        self._api_key = None
+        self._private_key = None
         self.base_url = "https://trading.robinhood.com"
 
+    @property
+    def api_key(self) -> str:
+        if self._api_key is None:
+            Config.validate()
+            self._api_key = Config.API_KEY
+        return self._api_key
+
+    @property
+    def private_key(self) -> Any:
+        if self._private_key is None:
+            from nacl.signing import SigningKey
+
+            Config.validate()
+            self._private_key = SigningKey(base64.b64decode(Config.PRIVATE_KEY))
+        return self._private_key
+
+    def validate_credentials(self) -> None:
+        """
+        Load the API key and signing key now instead of on the first request.
+        :raises EnvironmentError: If API_KEY or PRIVATE_KEY is missing.
+        """
+        _ = self.api_key, self.private_key
+
     @staticmethod
     def _get_current_timestamp() -> int:
         return int(datetime.datetime.now(tz=datetime.timezone.utc).timestamp())
@@ -41,6 +53,8 @@ class CryptoAPITrading:
         return "?" + "&".join(params)
 
     def make_api_request(self, method: str, path: str, body: str = "") -> Any:
+        import requests
+
         timestamp = self._get_current_timestamp()
         headers = self.get_authorization_header(method, path, body, timestamp)
         url = self.base_url + path
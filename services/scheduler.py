@@ -0,0 +1,129 @@
+import math
+import time
+
+from config.logging_config import logger
+
+
+class AdaptiveScheduler:
+    def __init__(self, base_interval=300, min_interval=30, max_interval=900, target_volatility=0.002,
+                 max_requests_per_hour=None, requests_per_tick=2, smoothing=0.2):
+        """
+        Deadline-aligned tick scheduler on the monotonic clock.
+
+        Each deadline is the previous deadline plus the current interval, so the time
+        spent fetching and evaluating does not push the schedule back. The interval
+        shrinks when recent volatility is above `target_volatility` and grows when the
+        market is quiet, always within [min_interval, max_interval] and the API budget.
+
+        :param base_interval: Seconds between ticks when volatility equals the target.
+        :param target_volatility: Expected absolute return over `base_interval`, e.g. 0.002 for 0.2%.
+        :param max_requests_per_hour: API budget; None for no limit.
+        :param requests_per_tick: API requests made on every tick.
+        :param smoothing: Weight of the newest observation in the volatility average (0-1].
+        """
+        if not 0 < min_interval <= base_interval <= max_interval:
+            raise ValueError("Intervals must satisfy 0 < min_interval <= base_interval <= max_interval.")
+
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_volatility = target_volatility
+        self.max_requests_per_hour = max_requests_per_hour
+        self.requests_per_tick = requests_per_tick
+        self.smoothing = smoothing
+
+        self.ticks = 0
+        self.missed = 0
+        self._deadline = None
+        self._variance_rate = None  # Smoothed squared log return per second
+        self._last_prices = {}
+        self._last_observed = None
+
+    @property
+    def floor(self):
+        """Shortest interval allowed by both `min_interval` and the API budget."""
+        if not self.max_requests_per_hour:
+            return self.min_interval
+        return max(self.min_interval, 3600 * self.requests_per_tick / self.max_requests_per_hour)
+
+    @property
+    def volatility(self):
+        """Smoothed absolute return expected over `base_interval`, None until two ticks were seen."""
+        if self._variance_rate is None:
+            return None
+        return math.sqrt(self._variance_rate * self.base_interval)
+
+    @property
+    def interval(self):
+        """Seconds until the next tick, from the current volatility estimate."""
+        volatility = self.volatility
+        if not volatility:
+            interval = self.base_interval
+        else:
+            interval = self.base_interval * self.target_volatility / volatility
+        return min(max(interval, self.floor), max(self.max_interval, self.floor))
+
+    @property
+    def miss_rate(self):
+        """Fraction of ticks that started after their deadline."""
+        return self.missed / self.ticks if self.ticks else 0.0
+
+    def reset(self):
+        """
+        Forget the schedule after the loop was stopped, so the first wait after a restart
+        is not counted as a missed deadline and the pause is not read as one long tick.
+        The volatility estimate and the tick counters are kept.
+        """
+        self._deadline = None
+        self._last_observed = None
+
+    def observe(self, prices):
+        """
+        Update the volatility estimate from the latest prices.
+        :param prices: Mapping of asset code to price; the most volatile symbol drives the interval.
+        """
+        now = time.monotonic()
+        elapsed = now - self._last_observed if self._last_observed is not None else None
+        self._last_observed = now
+
+        rates = []
+        for symbol, price in prices.items():
+            previous = self._last_prices.get(symbol)
+            self._last_prices[symbol] = price
+            if previous and price > 0 and elapsed:
+                rates.append(math.log(price / previous) ** 2 / elapsed)
+
+        if rates:
+            rate = max(rates)
+            if self._variance_rate is None:
+                self._variance_rate = rate
+            else:
+                self._variance_rate += self.smoothing * (rate - self._variance_rate)
+
+    def wait(self, stop_event=None):
+        """
+        Sleep until the next deadline.
+        :param stop_event: Optional threading.Event; waiting ends early when it is set.
+        :return: False if `stop_event` was set, True otherwise.
+        """
+        now = time.monotonic()
+        if self._deadline is None:
+            self._deadline = now
+        self._deadline += self.interval
+        self.ticks += 1
+
+        if self._deadline < now:
+            self.missed += 1
+            logger.warning(
+                f"Tick deadline missed by {now - self._deadline:.1f}s "
+                f"({self.missed}/{self.ticks} ticks missed so far)."
+            )
+            # Start the next period now instead of firing a burst of late ticks
+            self._deadline = now
+
+        remaining = self._deadline - now
+        logger.debug(f"Next tick in {remaining:.1f}s (interval {self.interval:.1f}s).")
+        if stop_event is not None:
+            return not stop_event.wait(remaining)
+        time.sleep(remaining)
+        return True
@@ -0,0 +1,394 @@
+import math
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+from config.logging_config import logger
+from modules.strategies import build_strategy
+
+FLOAT_SIZE = 8
+
+
+class SharedPriceBuffer:
+    def __init__(self, symbols, capacity, name=None):
+        """
+        Latest-tick buffers in shared memory, readable by worker processes without pickling.
+
+        Layout (float64): [sequence, per symbol: count + ring of `capacity` prices,
+        balances for USD and each symbol, per symbol: last BUY and SELL trade price].
+        The owner bumps the sequence to an odd value while writing and back to an
+        even value when done, so readers can detect and retry a torn read.
+
+        :param symbols: Asset codes, e.g. ("BTC", "ETH").
+        :param capacity: Number of recent prices kept per symbol.
+        :param name: Name of an existing block to attach to; a new block is created when None.
+        """
+        self.symbols = tuple(symbols)
+        self.capacity = capacity
+        self._price_offset = 1
+        self._balance_offset = self._price_offset + len(self.symbols) * (capacity + 1)
+        self._trade_offset = self._balance_offset + len(self.symbols) + 1
+        size = (self._trade_offset + 2 * len(self.symbols)) * FLOAT_SIZE
+
+        self._owner = name is None
+        if self._owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        # New shared memory blocks are zero-filled, which is an empty, consistent buffer
+        self._values = self.shm.buf.cast("d")
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _slot(self, symbol):
+        return self._price_offset + self.symbols.index(symbol) * (self.capacity + 1)
+
+    def publish(self, new_prices, balances, last_trades):
+        """
+        Append the latest prices and refresh the wallet state (owner side only).
+        :param new_prices: Mapping of asset code to the newest price.
+        :param balances: Mapping of "USD" and asset codes to balances.
+        :param last_trades: Mapping of asset code to (last buy price, last sell price), None when unknown.
+        """
+        values = self._values
+        values[0] += 1  # Odd: write in progress
+
+        for symbol, price in new_prices.items():
+            slot = self._slot(symbol)
+            count = int(values[slot])
+            values[slot + 1 + count % self.capacity] = price
+            values[slot] = count + 1
+
+        for index, symbol in enumerate(("USD",) + self.symbols):
+            values[self._balance_offset + index] = balances.get(symbol, 0)
+
+        for index, symbol in enumerate(self.symbols):
+            last_buy, last_sell = last_trades.get(symbol, (None, None))
+            values[self._trade_offset + 2 * index] = math.nan if last_buy is None else last_buy
+            values[self._trade_offset + 2 * index + 1] = math.nan if last_sell is None else last_sell
+
+        values[0] += 1  # Even: consistent again
+
+    def read(self):
+        """
+        Take a consistent copy of the buffer (worker side).
+        :return: (prices, balances, last_trades) with prices as oldest-to-newest lists.
+        """
+        values = self._values
+        while True:
+            sequence = values[0]
+            if int(sequence) % 2:
+                continue
+            snapshot = values.tolist()
+            if values[0] == sequence:
+                break
+
+        prices = {}
+        for symbol in self.symbols:
+            slot = self._slot(symbol)
+            count = int(snapshot[slot])
+            ring = snapshot[slot + 1:slot + 1 + self.capacity]
+            if count <= self.capacity:
+                prices[symbol] = ring[:count]
+            else:
+                start = count % self.capacity
+                prices[symbol] = ring[start:] + ring[:start]
+
+        balances = {
+            symbol: snapshot[self._balance_offset + index]
+            for index, symbol in enumerate(("USD",) + self.symbols)
+        }
+
+        last_trades = {}
+        for index, symbol in enumerate(self.symbols):
+            last_buy = snapshot[self._trade_offset + 2 * index]
+            last_sell = snapshot[self._trade_offset + 2 * index + 1]
+            last_trades[symbol] = (
+                None if math.isnan(last_buy) else last_buy,
+                None if math.isnan(last_sell) else last_sell,
+            )
+        return prices, balances, last_trades
+
+    def close(self):
+        self._values.release()
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+class ShardWallet:
+    def __init__(self, balances):
+        """Worker-side copy of the wallet. Changes stay local; the owner applies the real trades."""
+        self.balances = balances
+
+    def get_balance(self, symbol):
+        return self.balances.get(symbol, 0)
+
+    def update_balance(self, symbol, amount, action, price):
+        if action == "BUY":
+            self.balances["USD"] -= amount * price
+            self.balances[symbol] = self.balances.get(symbol, 0) + amount
+        elif action == "SELL":
+            self.balances["USD"] += amount * price
+            self.balances[symbol] = self.balances.get(symbol, 0) - amount
+
+
+class ShardModel:
+    """
+    Read-only stand-in for TradingBotModel inside a worker process, backed by a
+    SharedPriceBuffer snapshot taken at the start of each tick.
+    """
+
+    def __init__(self):
+        self.wallet = ShardWallet({})
+        self._prices = {}
+        self._last_trades = {}
+
+    def load(self, snapshot):
+        self._prices, balances, self._last_trades = snapshot
+        self.wallet = ShardWallet(balances)
+
+    def get_prices(self, symbol):
+        return list(self._prices.get(symbol, []))
+
+    def get_fill_price(self, symbol, action, amount, price):
+        # Fills are priced by the owner when the intent is applied
+        return price
+
+    def get_last_trade_price(self, symbol, action):
+        last_buy, last_sell = self._last_trades.get(symbol, (None, None))
+        return last_buy if action.upper() == "BUY" else last_sell
+
+
+def _worker_main(worker_index, buffer_name, symbols, capacity, shards, warm_up, tasks, results):
+    """
+    Worker process loop: evaluate the assigned (strategy, symbol) shards on every tick
+    and send back trade intents instead of touching the real wallet.
+    :param worker_index: Position of this worker, sent back with every result.
+    :param warm_up: Mapping of asset code to historical prices used to seed the strategies.
+    """
+    buffer = SharedPriceBuffer(symbols, capacity, name=buffer_name)
+    model = ShardModel()
+    intents = []
+    strategies = []
+
+    for shard_index, name, params, symbol in shards:
+        def record_intent(strategy, action, trade_symbol, amount, price, usd_balance, symbol_balance,
+                          shard_index=shard_index):
+            intents.append((shard_index, strategy, action, trade_symbol, amount, price))
+
+        strategy = build_strategy(name, params, model, record_intent)
+        if warm_up.get(symbol):
+            strategy.warm_up(symbol, warm_up[symbol])
+        strategies.append((strategy, symbol))
+
+    try:
+        while True:
+            message = tasks.get()
+            if message is None:
+                break
+
+            tick, updated_symbols = message
+            model.load(buffer.read())
+            intents.clear()
+            for strategy, symbol in strategies:
+                prices = model.get_prices(symbol)
+                if symbol in updated_symbols and prices:
+                    try:
+                        strategy.evaluate(symbol, prices[-1])
+                    except Exception as e:
+                        # One failing shard must not take down the worker and the other shards with it
+                        logger.error(f"{type(strategy).__name__} failed on {symbol} in a strategy worker: {e}",
+                                     exc_info=True)
+            results.put((worker_index, tick, list(intents)))
+    finally:
+        buffer.close()
+
+
+class ShardedStrategyRunner:
+    def __init__(self, model, strategies, record_trade_callback, symbols=("BTC", "ETH"), workers=None,
+                 timeout=60):
+        """
+        Evaluate (strategy, symbol) pairs in worker processes.
+        Prices and wallet state reach the workers through shared memory; workers send
+        back trade intents, which are applied here so the wallet keeps a single owner.
+
+        :param model: TradingBotModel owning the wallet and price history.
+        :param strategies: List of (name, params) pairs for `build_strategy`.
+        :param record_trade_callback: Called for each applied trade, as for in-process strategies.
+        :param symbols: Asset codes to shard across.
+        :param workers: Number of worker processes, defaults to the CPU count.
+        :param timeout: Seconds to wait for every worker's intents before giving up on a tick.
+        """
+        self.model = model
+        self.record_trade = record_trade_callback
+        self.symbols = tuple(symbols)
+        self.timeout = timeout
+        self.capacity = model.max_prices or 10
+
+        shards = [
+            (index, name, params, symbol)
+            for index, (name, params, symbol) in enumerate(
+                (name, params, symbol) for name, params in strategies for symbol in self.symbols
+            )
+        ]
+        worker_count = max(1, min(workers or os.cpu_count() or 1, len(shards)))
+        self._assignments = [shards[index::worker_count] for index in range(worker_count)]
+
+        self._buffer = None
+        self._processes = []
+        self._tasks = []
+        self._results = None
+        self._dead = set()
+        self._tick = 0
+        self._warm_up = {}
+        self._dead = set()  # Indexes of workers that exited unexpectedly
+
+    def warm_up(self, prices_by_symbol):
+        """
+        Keep historical prices for seeding the strategies when the workers start.
+        :param prices_by_symbol: Mapping of asset code to prices, oldest first.
+        """
+        if self.is_started:
+            logger.warning("Strategy workers are already running, ignoring warm-up history.")
+            return
+        self._warm_up = {symbol: list(prices) for symbol, prices in prices_by_symbol.items()}
+
+    @property
+    def is_started(self):
+        return self._buffer is not None
+
+    def start(self):
+        """Create the shared buffer and start the worker processes."""
+        if self.is_started:
+            return
+
+        context = multiprocessing.get_context("spawn")  # The bot runs in a thread, so avoid fork
+        self._buffer = SharedPriceBuffer(self.symbols, self.capacity)
+        self._results = context.Queue()
+
+        # Seed the ring buffers with the history the model already has
+        history = {symbol: self.model.get_prices(symbol) or [] for symbol in self.symbols}
+        for position in range(max((len(prices) for prices in history.values()), default=0)):
+            self._buffer.publish(
+                {symbol: prices[position] for symbol, prices in history.items() if position < len(prices)},
+                {}, {},
+            )
+
+        for worker_index, shards in enumerate(self._assignments):
+            tasks = context.Queue()
+            process = context.Process(
+                target=_worker_main,
+                args=(worker_index, self._buffer.name, self.symbols, self.capacity, shards, self._warm_up, tasks, self._results),
+                daemon=True,
+            )
+            process.start()
+            self._tasks.append(tasks)
+            self._processes.append(process)
+
+        logger.info(f"Started {len(self._processes)} strategy workers for {sum(map(len, self._assignments))} shards.")
+
+    def evaluate(self, prices):
+        """
+        Publish the tick, wait for every worker and apply the returned intents in shard order.
+        :param prices: Mapping of asset code to the latest mid price, already added to the model.
+        """
+        if not self.is_started:
+            self.start()
+
+        self._tick += 1
+        self._buffer.publish(
+            prices,
+            dict(self.model.wallet.snapshot().balances),
+            {
+                symbol: (self.model.get_last_trade_price(symbol, "BUY"), self.model.get_last_trade_price(symbol, "SELL"))
+                for symbol in self.symbols
+            },
+        )
+        for tasks in self._tasks:
+            tasks.put((self._tick, tuple(prices)))
+
+        # Every live worker answers every tick exactly once. Results for earlier ticks can still be
+        # queued after a timeout; they are dropped so this tick waits for all of its own results.
+        intents = []
+        waiting = set(range(len(self._processes))) - self._dead
+        deadline = time.monotonic() + self.timeout
+        while waiting:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error(f"Timed out waiting for strategy workers on tick {self._tick}, "
+                             f"{len(waiting)} of {len(self._processes)} did not report.")
+                break
+            try:
+                # Wake up regularly to notice workers that died instead of sleeping until the deadline
+                worker_index, tick, worker_intents = self._results.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                self._check_workers(waiting)
+                continue
+            if tick == self._tick:
+                intents.extend(worker_intents)
+                waiting.discard(worker_index)
+            else:
+                logger.debug(f"Dropping late strategy results for tick {tick}.")
+
+        # Intents from the workers that did report are still applied
+
+        for _, strategy, action, symbol, amount, price in sorted(intents, key=lambda intent: intent[0]):
+            self._apply_intent(strategy, action, symbol, amount, price)
+
+    def _check_workers(self, waiting):
+        """Stop waiting for workers whose process has exited."""
+        for worker_index in list(waiting):
+            process = self._processes[worker_index]
+            if not process.is_alive():
+                waiting.discard(worker_index)
+                self._dead.add(worker_index)
+                logger.error(f"Strategy worker {worker_index} exited with code {process.exitcode}, "
+                             f"its {len(self._assignments[worker_index])} shards are no longer evaluated.")
+
+    def _apply_intent(self, strategy, action, symbol, amount, price):
+        """
+        Apply one intent to the real wallet. Workers decided on the same pre-tick
+        balances, so amounts are clamped to what is still available.
+        """
+        wallet = self.model.wallet
+        fill_price = self.model.get_fill_price(symbol, action, amount, price)
+
+        if action == "BUY":
+            amount = min(amount, wallet.get_balance("USD") / fill_price)
+        elif action == "SELL":
+            amount = min(amount, wallet.get_balance(symbol))
+        if amount <= 0:
+            logger.warning(f"Skipping {action} intent from {strategy} for {symbol}: insufficient balance.")
+            return
+
+        try:
+            wallet.update_balance(symbol, amount, action, fill_price)
+        except ValueError as e:
+            logger.warning(f"Skipping {action} intent from {strategy} for {symbol}: {e}")
+            return
+        self.record_trade(strategy, action, symbol, amount, fill_price,
+                          wallet.get_balance("USD"), wallet.get_balance(symbol))
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if not self.is_started:
+            return
+
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+        self._buffer.close()
+        self._buffer = None
+        self._processes = []
+        self._tasks = []
+        self._results = None
+        self._dead = set()
@@ -0,0 +1,193 @@
+import math
+import os
+import struct
+import time
+import zlib
+from bisect import bisect_left
+from datetime import datetime
+
+from config.logging_config import logger
+from services.batching_writer import BatchingWriter
+
+DEFAULT_TICK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "ticks")
+
+# Log layout: a sequence of blocks, each a BLOCK_HEADER followed by `compressed size` bytes of
+# zlib-compressed RECORDs. The `.idx` sidecar holds one INDEX_ENTRY per block so readers can
+# seek straight to the blocks covering a time range.
+RECORD = struct.Struct("<dd8sdd")  # received time, API time (NaN if unknown), symbol, bid, ask
+BLOCK_HEADER = struct.Struct("<4sII")  # magic, record count, compressed size
+BLOCK_MAGIC = b"TICK"
+INDEX_ENTRY = struct.Struct("<ddQI")  # first received time, last received time, block offset, record count
+
+
+def parse_api_timestamp(value):
+    """Convert an API timestamp such as "2024-11-24T19:05:23.513465Z" to epoch seconds, None if invalid."""
+    if not value:
+        return None
+    try:
+        text = value.replace("Z", "+00:00")
+        if "." in text:
+            # Python < 3.11 only accepts up to microsecond precision
+            head, _, tail = text.partition(".")
+            digits = len(tail) - len(tail.lstrip("0123456789"))
+            text = f"{head}.{tail[:min(digits, 6)].ljust(6, '0')}{tail[digits:]}"
+        return datetime.fromisoformat(text).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class TickRecorder:
+    def __init__(self, directory=DEFAULT_TICK_DIR, block_records=256, flush_interval=5.0,
+                 max_bytes=64 * 1024 * 1024, max_age=24 * 60 * 60):
+        """
+        Append every raw quote to compressed binary logs from a background thread, so the
+        tick loop only pays for a queue put.
+        :param directory: Directory for the `ticks-*.bin` logs and their `.idx` files.
+        :param block_records: Records compressed together into one block.
+        :param flush_interval: Seconds after which a partial block is written anyway.
+        :param max_bytes: Start a new log once the current one reaches this size.
+        :param max_age: Start a new log once the current one is this many seconds old.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._file = None
+        self._index = None
+        self._opened_at = None
+        self.path = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._writer = BatchingWriter(self._write_block_safely, block_records, flush_interval,
+                                      on_close=self._close_files, name="tick-recorder")
+
+    def record(self, symbol, bid, ask, api_timestamp=None, timestamp=None):
+        """
+        Queue one quote.
+        :param api_timestamp: Quote time reported by the API, as epoch seconds or an ISO string.
+        :param timestamp: Time the quote was received, defaults to now.
+        """
+        if isinstance(api_timestamp, str):
+            api_timestamp = parse_api_timestamp(api_timestamp)
+        self._writer.put((
+            time.time() if timestamp is None else timestamp,
+            math.nan if api_timestamp is None else api_timestamp,
+            symbol.encode("ascii", errors="replace")[:8],
+            bid,
+            ask,
+        ))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written."""
+        return self._writer.flush(timeout)
+
+    def close(self):
+        """Write pending quotes, close the current log and stop the writer thread."""
+        self._writer.close()
+
+    def _write_block_safely(self, records):
+        try:
+            self._write_block(records)
+        except OSError as e:
+            logger.error(f"Failed to write {len(records)} ticks to {self.path}: {e}", exc_info=True)
+
+    def _write_block(self, records):
+        self._rotate_if_needed()
+        payload = zlib.compress(b"".join(RECORD.pack(*record) for record in records))
+        offset = self._file.tell()
+        self._file.write(BLOCK_HEADER.pack(BLOCK_MAGIC, len(records), len(payload)))
+        self._file.write(payload)
+        self._file.flush()
+        # The index entry is written after its block, so a crash never indexes a partial block
+        self._index.write(INDEX_ENTRY.pack(records[0][0], records[-1][0], offset, len(records)))
+        self._index.flush()
+
+    def _rotate_if_needed(self):
+        if self._file is not None:
+            too_big = self._file.tell() >= self.max_bytes
+            too_old = time.monotonic() - self._opened_at >= self.max_age
+            if not (too_big or too_old):
+                return
+            self._close_files()
+
+        # The sequence number keeps names unique and sortable when logs rotate within a second
+        name, sequence = f"ticks-{time.strftime('%Y%m%d-%H%M%S')}", 0
+        path = os.path.join(self.directory, f"{name}-{sequence:03d}.bin")
+        while os.path.exists(path):
+            sequence += 1
+            path = os.path.join(self.directory, f"{name}-{sequence:03d}.bin")
+        self.path = path
+        self._file = open(path, mode="ab")
+        self._index = open(path[:-len(".bin")] + ".idx", mode="ab")
+        self._opened_at = time.monotonic()
+        logger.info(f"Recording ticks to {path}.")
+
+    def _close_files(self):
+        for file in (self._file, self._index):
+            if file is not None:
+                file.close()
+        self._file = self._index = None
+
+
+class TickLogReader:
+    def __init__(self, directory=DEFAULT_TICK_DIR):
+        """Read quotes written by TickRecorder, using the `.idx` files to skip blocks outside a time range."""
+        self.directory = directory
+
+    def files(self):
+        """Log files, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(".bin"))
+        return [os.path.join(self.directory, name) for name in names]
+
+    @staticmethod
+    def read_index(path):
+        """Return the (first time, last time, offset, count) entries of a log's index."""
+        index_path = path[:-len(".bin")] + ".idx"
+        if not os.path.exists(index_path):
+            return []
+        with open(index_path, mode="rb") as file:
+            data = file.read()
+        usable = len(data) - len(data) % INDEX_ENTRY.size  # Ignore a torn trailing entry
+        return [entry for entry in INDEX_ENTRY.iter_unpack(data[:usable])]
+
+    def read(self, symbol=None, start=None, end=None):
+        """
+        Yield quotes as (received time, API time or None, symbol, bid, ask), oldest first.
+        :param start: Only quotes received at or after this time (epoch seconds).
+        :param end: Only quotes received before this time (epoch seconds).
+        """
+        wanted = symbol.encode("ascii") if symbol else None
+        for path in self.files():
+            index = self.read_index(path)
+            if not index or (end is not None and index[0][0] >= end):
+                continue
+            # Blocks are written in time order, so skip straight to the first that can contain `start`
+            first = bisect_left([entry[1] for entry in index], start) if start is not None else 0
+
+            with open(path, mode="rb") as file:
+                for first_time, _, offset, count in index[first:]:
+                    if end is not None and first_time >= end:
+                        break
+                    file.seek(offset)
+                    magic, _, size = BLOCK_HEADER.unpack(file.read(BLOCK_HEADER.size))
+                    if magic != BLOCK_MAGIC:
+                        logger.warning(f"Corrupt tick block at offset {offset} in {path}, skipping the rest.")
+                        break
+                    records = RECORD.iter_unpack(zlib.decompress(file.read(size)))
+                    for received, api_time, raw_symbol, bid, ask in records:
+                        raw_symbol = raw_symbol.rstrip(b"\0")
+                        if wanted is not None and raw_symbol != wanted:
+                            continue
+                        if (start is not None and received < start) or (end is not None and received >= end):
+                            continue
+                        yield (received, None if math.isnan(api_time) else api_time, raw_symbol.decode("ascii"),
+                               bid, ask)
+
+    def load_prices(self, symbol, start=None, end=None):
+        """Mid prices as (timestamp_ms, price) rows, the format of `simulation.backtest.load_prices`."""
+        return [
+            (int(received * 1000), (bid + ask) / 2)
+            for received, _, _, bid, ask in self.read(symbol, start, end)
+            if bid > 0 and ask > 0
+        ]
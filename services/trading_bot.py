@@ -1,44 +1,101 @@
+import math
 import time
 from datetime import datetime
-from threading import Thread
+from threading import Event, Thread
 
-import pytz
 from config.logging_config import logger
-from modules.moving_average import MovingAverageStrategy
-from modules.percentage_base import PercentageBasedStrategy
+from modules.risk import RiskManager
+from modules.strategies import build_strategy
 from modules.trade_history import TradeHistoryModel
 from modules.trading_utils import get_best_bid_ask
+from services.execution_model import DepthExecutionModel
+from services.profiler import BotProfiler
 from services.robinhood_api_trading import CryptoAPITrading
+from services.scheduler import AdaptiveScheduler
+from services.sharded_strategies import ShardedStrategyRunner
 
 
+# Strategies the bot runs when none are given, as (name, params) pairs for `build_strategy`
+DEFAULT_STRATEGIES = [
+    ("percentage_based", {"profit_margin": 0.05, "loss_margin": 0.05}),
+    ("moving_average", {"short_window": 5, "long_window": 20, "required_profit_percent": 10}),
+]
+
+# Assets whose stored ticks seed the strategies at startup
+WARM_UP_SYMBOLS = ("BTC", "ETH")
+# Stored history is only used when its newest tick is at most this many trade intervals old
+WARM_UP_MAX_AGE_INTERVALS = 3
+
 
 class TradingBot:
-    def __init__(self, model):
+    def __init__(self, model, api_client=None, strategies=None, execution_model=None, workers=None,
+                 store=None, scheduler=None, recorder=None, stop_loss=None, take_profit=None, exporter=None):
         """
         Initialize the trading bot with a model and strategies.
+        :param model: TradingBotModel holding the wallet and price history.
+        :param api_client: Optional CryptoAPITrading client, shared when several bots run side by side.
+        :param strategies: Optional list of (name, params) pairs, defaults to `DEFAULT_STRATEGIES`.
+        :param execution_model: Optional execution model, shared when several bots run side by side.
+        :param workers: When set, evaluate strategies in this many worker processes instead of in the bot thread.
+        :param store: Optional HistoryStore that persists trades and ticks.
+        :param scheduler: Optional AdaptiveScheduler, defaults to one centred on the model's trade interval.
+        :param recorder: Optional TickRecorder that logs every raw quote the bot fetches.
+        :param stop_loss: When set, sell any bought lot that falls this fraction below its entry price.
+        :param take_profit: When set, sell any bought lot that rises this fraction above its entry price.
+        :param exporter: Optional RunExporter that streams trades and the per-tick equity to columnar files.
+            It is closed when the bot stops.
         """
         self.is_running = False
         self.thread = None
         self.model = model  # Instance of TradingBotModel
+        self.store = store
+        self.recorder = recorder
+        self.exporter = exporter
+        self._stop_event = Event()
+        self.warmed_up = False
+        # Idle until a CPU/memory profile or the strategy timers are requested at runtime
+        self.profiler = BotProfiler()
+
+        # Poll faster in volatile markets and slower in quiet ones, around the configured interval
+        self.scheduler = scheduler or AdaptiveScheduler(
+            base_interval=model.trade_interval,
+            min_interval=model.trade_interval / 5,
+            max_interval=model.trade_interval * 3,
+        )
 
-        # Initialize strategies directly
-        # Initialize strategies directly
-        self.strategies = [
-            PercentageBasedStrategy(0.05, 0.05, model, self.record_trade),
-            MovingAverageStrategy(5, 20, model, self.record_trade, required_profit_percent=10),
-        ]
+        self.risk = None
+        if stop_loss is not None or take_profit is not None:
+            self.risk = RiskManager(model, self.record_trade, stop_loss=stop_loss, take_profit=take_profit)
+
+        self.strategies = []
+        self.sharded_runner = None
+        if workers:
+            self.sharded_runner = ShardedStrategyRunner(model, strategies or DEFAULT_STRATEGIES, self.record_trade,
+                                                        workers=workers)
+        else:
+            self.strategies = [
+                build_strategy(name, params, model, self.record_trade)
+                for name, params in (strategies or DEFAULT_STRATEGIES)
+            ]
 
         # API Client
-        self.api_client = CryptoAPITrading()
+        self.api_client = api_client or CryptoAPITrading()
+        # Estimate fills from the order book instead of filling at the mid price
+        model.execution_model = execution_model or DepthExecutionModel(self.api_client, ttl=model.trade_interval)
         usd_balance = model.wallet.get_balance("USD")
         logger.info("TradingBot initialized with initial investment of $%.2f.", usd_balance)
 
     def start(self):
         """
         Start the bot in a separate thread.
+        :raises EnvironmentError: If the API credentials are missing, before any price is fetched.
         """
         if not self.is_running:
+            # Without credentials every fetch would fail and be retried for minutes, so fail here instead
+            self.api_client.validate_credentials()
+            self.scheduler.reset()
             self.is_running = True
+            self._stop_event.clear()
             self.thread = Thread(target=self.run, daemon=True)
             self.thread.start()
 
@@ -47,40 +104,144 @@ class TradingBot:
         Signal the bot to stop running.
         """
         self.is_running = False
+        self._stop_event.set()  # Wake the loop if it is waiting for the next tick
         if self.thread:
             self.thread.join()
+        if self.sharded_runner:
+            self.sharded_runner.close()
+        if self.store:
+            self.store.flush()
+        if self.recorder:
+            self.recorder.flush()
+        if self.exporter:
+            # Closing writes the Arrow end-of-stream marker; a later run needs a new exporter
+            self.exporter.close()
+            self.exporter = None
 
     def run(self):
         """
         Start the trading bot.
         """
         logger.info("Starting live trading simulation...")
+        if not self.warmed_up:
+            try:
+                self.warm_start()
+            except Exception as e:
+                # Strategies still work without history, they just need longer to fill their windows
+                logger.warning(f"Warm start failed, strategies will warm up from live ticks: {e}")
+
         while self.is_running:
             try:
+                self.profiler.on_tick_start()
+
                 # Fetch live prices for BTC and ETH
                 btc_price = self.fetch_live_prices("BTC-USD")
                 eth_price = self.fetch_live_prices("ETH-USD")
 
-                # Append latest prices to sliding window
-                self.model.add_btc_price(btc_price)
-                self.model.add_eth_price(eth_price)
-
                 logger.info(
                     f"Latest Prices - BTC: ${btc_price:.2f}, ETH: ${eth_price:.2f}, Time: {self.get_est_time()}"
                 )
 
-                # Run percentage-based strategy
-                for strategy in self.strategies:
-                    strategy.evaluate("BTC", btc_price)
-                    strategy.evaluate("ETH", eth_price)
+                prices = {"BTC": btc_price, "ETH": eth_price}
+                self.process_tick(prices)
+                self.scheduler.observe(prices)
+                self.profiler.on_tick_end()
 
-                # Sleep until the next interval
-                time.sleep(self.model.trade_interval)
+                # Sleep until the next deadline
+                if not self.scheduler.wait(self._stop_event):
+                    break
 
             except Exception as e:
                 logger.error(f"Error occurred: {e}", exc_info=True)
                 break
 
+    def warm_start(self, history=None, count=500, max_age=None):
+        """
+        Seed the model's price history and every strategy's indicators in bulk, so
+        strategies can trade from the first live tick instead of waiting for their windows to fill.
+        Prices that are not positive are dropped, and an asset whose newest price is older than
+        `max_age` is not seeded at all: stale history would make the first live tick look like a jump.
+        :param history: Optional mapping of asset code to (timestamp in seconds, price) pairs, oldest first.
+            Defaults to the newest ticks in the store.
+        :param count: Number of most recent prices used per asset.
+        :param max_age: Maximum age in seconds of the newest price, defaults to
+            `WARM_UP_MAX_AGE_INTERVALS` trade intervals.
+        """
+        history = self.load_warm_up_history(count) if history is None else history
+        max_age = self.model.trade_interval * WARM_UP_MAX_AGE_INTERVALS if max_age is None else max_age
+        now = time.time()
+
+        fresh = {}
+        for symbol, rows in history.items():
+            rows = [(timestamp, price) for timestamp, price in rows if math.isfinite(price) and price > 0][-count:]
+            if not rows:
+                logger.info(f"Skipping warm start for {symbol}: no stored prices.")
+            elif now - rows[-1][0] > max_age:
+                logger.info(f"Skipping warm start for {symbol}: newest stored price is "
+                            f"{(now - rows[-1][0]) / 60:.0f} minutes old (limit {max_age / 60:.0f}).")
+            else:
+                fresh[symbol] = rows
+
+        prices_by_symbol = {}
+        for symbol, rows in fresh.items():
+            self.model.seed_prices(symbol, rows)
+            prices = [price for _, price in rows]
+            for strategy in self.strategies:
+                strategy.warm_up(symbol, prices)
+            prices_by_symbol[symbol] = prices
+
+        self.model.aligned.load(fresh)
+        if self.sharded_runner:
+            self.sharded_runner.warm_up(prices_by_symbol)
+        self.warmed_up = True
+        if prices_by_symbol:
+            seeded = ", ".join(f"{symbol}: {len(prices)} prices" for symbol, prices in prices_by_symbol.items())
+            logger.info(f"Warm start seeded {seeded}.")
+        else:
+            logger.info("Warm start found no recent history, strategies will warm up from live ticks.")
+
+    def load_warm_up_history(self, count=500):
+        """
+        Return up to `count` of the newest (timestamp in seconds, price) pairs per asset from the store.
+        The bundled simulation CSVs are never used here: they are months old and would seed
+        the live strategies with prices far from the market.
+        """
+        if not self.store:
+            return {}
+        return {
+            symbol: [(timestamp, price) for timestamp, price, _, _ in self.store.latest_ticks(symbol, count)]
+            for symbol in WARM_UP_SYMBOLS
+        }
+
+    def process_tick(self, prices):
+        """
+        Append the latest prices to the model and run every strategy on them.
+        :param prices: Mapping of asset code to mid price, e.g. {"BTC": 96374.1, "ETH": 3332.0}.
+        """
+        timestamp = time.time()  # One timestamp per tick keeps the symbols aligned in the model
+        # Symbols whose fetch failed are left out of the tick rather than traded at a price of 0
+        prices = {symbol: price for symbol, price in prices.items() if self.model.add_price(symbol, price, timestamp)}
+        if self.store:
+            # Stored with the tick's timestamp, so they line up with the model's bars and aligned rows
+            for symbol, price in prices.items():
+                self.store.record_tick(symbol, price, timestamp)
+
+        # Protective exits run on the new prices before any strategy trades on them
+        if self.risk:
+            for symbol, price in prices.items():
+                self.risk.on_price(symbol, price)
+
+        if self.sharded_runner:
+            self.sharded_runner.evaluate(prices)
+
+        for strategy in self.strategies:
+            with self.profiler.time_strategy(type(strategy).__name__):
+                for symbol, price in prices.items():
+                    strategy.evaluate(symbol, price)
+
+        if self.exporter:
+            self.exporter.on_equity(timestamp, self.model.total_balance)
+
     def record_trade(self, strategy, action, symbol, amount, price, usd_balance, symbol_balance):
         trade = TradeHistoryModel(
             strategy=strategy,
@@ -92,6 +253,12 @@ class TradingBot:
             symbol_balance=symbol_balance,
         )
         self.model.add_trade(trade)
+        if self.risk:
+            self.risk.on_trade(trade)
+        if self.exporter:
+            self.exporter.on_trade(trade)
+        if self.store:
+            self.store.record_trade(trade)
 
     def fetch_live_prices(self, symbol):
         """
@@ -102,7 +269,8 @@ class TradingBot:
         wait_time = 300  # Wait time in seconds (5 minutes)
 
         for attempt in range(retries):
-            bid, ask = get_best_bid_ask(self.api_client, symbol)
+            bid, ask = get_best_bid_ask(self.api_client, symbol,
+                                        on_quote=self.recorder.record if self.recorder else None)
 
             if bid > 0 and ask > 0:
                 mid_price = (bid + ask) / 2
@@ -120,6 +288,8 @@ class TradingBot:
     @staticmethod
     def get_est_time():
         """Get the current time in EST."""
+        import pytz
+
         utc_time = datetime.now(tz=pytz.utc)
         est_time = utc_time.astimezone(pytz.timezone("US/Eastern"))
         return est_time.strftime("%Y-%m-%d %H:%M:%S %Z")
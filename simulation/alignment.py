@@ -0,0 +1,60 @@
+import numpy as np
+
+from simulation.backtest import load_default_prices
+
+
+def _as_columns(rows):
+    """Split (timestamp, price) rows into two float arrays sorted by time."""
+    array = np.asarray(rows, dtype=float).reshape(-1, 2)
+    order = np.argsort(array[:, 0], kind="stable")
+    return array[order, 0], array[order, 1]
+
+
+def time_grid(series_by_symbol, step=None):
+    """
+    Common time grid for several series.
+    :param step: Spacing of a regular grid from the earliest to the latest timestamp;
+        when omitted the grid is the union of every series' timestamps.
+    """
+    timestamps = [_as_columns(rows)[0] for rows in series_by_symbol.values()]
+    timestamps = [values for values in timestamps if len(values)]
+    if not timestamps:
+        return np.empty(0)
+    if step is None:
+        return np.unique(np.concatenate(timestamps))
+    start = min(values[0] for values in timestamps)
+    end = max(values[-1] for values in timestamps)
+    return start + step * np.arange(int((end - start) // step) + 1)
+
+
+def asof_join(series_by_symbol, grid=None, step=None, max_staleness=None):
+    """
+    Align any number of price series onto one time grid. Each grid point takes the
+    latest price at or before it (forward fill); points before a series starts, or
+    whose latest price is older than `max_staleness`, are NaN.
+    :param series_by_symbol: Mapping of asset code to (timestamp, price) rows, e.g. from `load_prices`.
+    :param grid: Optional timestamps to align onto, overrides `step`.
+    :param step: Spacing of a regular grid, see `time_grid`.
+    :param max_staleness: Largest allowed age of a forward-filled price, in timestamp units.
+    :return: (grid, {asset code: prices aligned with grid}).
+    """
+    grid = time_grid(series_by_symbol, step) if grid is None else np.asarray(grid, dtype=float)
+    aligned = {}
+    for symbol, rows in series_by_symbol.items():
+        timestamps, prices = _as_columns(rows)
+        values = np.full(len(grid), np.nan)
+        if len(timestamps):
+            index = np.searchsorted(timestamps, grid, side="right") - 1
+            known = index >= 0
+            values[known] = prices[index[known]]
+            if max_staleness is not None:
+                age = np.full(len(grid), np.inf)
+                age[known] = grid[known] - timestamps[index[known]]
+                values[age > max_staleness] = np.nan
+        aligned[symbol] = values
+    return grid, aligned
+
+
+def align_default_prices(step=None, max_staleness=None):
+    """As-of join of the bundled BTC and ETH histories (millisecond timestamps)."""
+    return asof_join(load_default_prices(), step=step, max_staleness=max_staleness)
@@ -0,0 +1,153 @@
+import csv
+import os
+from datetime import datetime
+
+from modules.risk import RiskManager
+from modules.strategies import build_strategy
+from modules.trade_history import TradeHistoryModel
+from modules.trading_bot_model import TradingBotModel
+
+SIMULATION_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_prices(filename):
+    """
+    Load a `timestamp,price` CSV as a list of (timestamp_ms, price) tuples sorted by time.
+    Relative filenames are resolved against the simulation directory.
+    """
+    filepath = filename if os.path.isabs(filename) else os.path.join(SIMULATION_DIR, filename)
+    with open(filepath, mode='r', newline='') as file:
+        reader = csv.reader(file)
+        next(reader)  # Skip the header row
+        rows = [(int(row[0]), float(row[1])) for row in reader if row]
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def load_default_prices():
+    """Load the bundled BTC and ETH price histories."""
+    return {
+        "BTC": load_prices("btc_prices.csv"),
+        "ETH": load_prices("eth_prices.csv"),
+    }
+
+
+def merge_series(prices_by_symbol):
+    """
+    Merge per-symbol price series into one event stream of (timestamp_ms, symbol, price),
+    ordered by time the same way the live bot would have seen the ticks.
+    """
+    events = [
+        (timestamp, symbol, price)
+        for symbol, rows in prices_by_symbol.items()
+        for timestamp, price in rows
+    ]
+    events.sort(key=lambda event: (event[0], event[1]))
+    return events
+
+
+class BacktestResult:
+    def __init__(self, initial_investment, equity, trades):
+        """
+        The outcome of a single backtest run.
+        :param initial_investment: Starting USD balance.
+        :param equity: List of (timestamp_ms, total_balance) pairs, one per event.
+        :param trades: List of TradeHistoryModel objects in execution order.
+        """
+        self.initial_investment = initial_investment
+        self.equity = equity
+        self.trades = trades
+
+    @property
+    def final_balance(self):
+        return self.equity[-1][1] if self.equity else self.initial_investment
+
+    @property
+    def total_return(self):
+        """Return over the run as a fraction, e.g. 0.05 for +5%."""
+        if not self.initial_investment:
+            return 0.0
+        return self.final_balance / self.initial_investment - 1
+
+    def __repr__(self):
+        return (
+            f"BacktestResult("
+            f"Final Balance: ${self.final_balance:.2f}, "
+            f"Return: {self.total_return * 100:.2f}%, "
+            f"Trades: {len(self.trades)}"
+            f")"
+        )
+
+
+class Backtest:
+    def __init__(self, strategy_name, params=None, initial_investment=2000, stop_loss=None, take_profit=None):
+        """
+        Replay a price event stream through a registered strategy with a fresh wallet.
+        :param stop_loss: Optional stop-loss fraction applied to every bought lot, see RiskManager.
+        :param take_profit: Optional take-profit fraction applied to every bought lot.
+        """
+        self.strategy_name = strategy_name
+        self.params = params or {}
+        self.initial_investment = initial_investment
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self._current_date = None
+        self._risk = None
+        self._exporter = None
+
+    def run(self, events, exporter=None, warm_up=None):
+        """
+        Run the strategy over (timestamp_ms, symbol, price) events.
+        :param exporter: Optional RunExporter that receives every trade and equity point as they happen.
+        :param warm_up: Optional earlier events that seed the price history and the strategy's
+            indicators before the run, as the live bot's warm start does. They are not traded or scored.
+        :return: A BacktestResult.
+        """
+        model = TradingBotModel(initial_investment=self.initial_investment)
+        record_trade = self._record_trade(model)
+        strategy = build_strategy(self.strategy_name, self.params, model, record_trade)
+        if warm_up:
+            history = {}
+            for timestamp, symbol, price in warm_up:
+                history.setdefault(symbol, []).append((timestamp / 1000, price))
+            for symbol, rows in history.items():
+                model.seed_prices(symbol, rows)
+                strategy.warm_up(symbol, [price for _, price in rows])
+        self._risk = None
+        self._exporter = exporter
+        if self.stop_loss is not None or self.take_profit is not None:
+            self._risk = RiskManager(model, record_trade, self.stop_loss, self.take_profit)
+        equity = []
+
+        for timestamp, symbol, price in events:
+            self._current_date = datetime.fromtimestamp(timestamp / 1000)
+            model.add_price(symbol, price, timestamp / 1000)
+            if self._risk:
+                self._risk.on_price(symbol, price)
+            strategy.evaluate(symbol, price)
+            balance = model.total_balance
+            equity.append((timestamp, balance))
+            if exporter:
+                exporter.on_equity(timestamp / 1000, balance)
+
+        return BacktestResult(self.initial_investment, equity, list(model.iter_trades()))
+
+    def _record_trade(self, model):
+        def record_trade(strategy, action, symbol, amount, price, usd_balance, symbol_balance):
+            trade = TradeHistoryModel(
+                strategy=strategy,
+                action=action,
+                symbol=symbol,
+                amount=amount,
+                price=price,
+                usd_balance=usd_balance,
+                symbol_balance=symbol_balance,
+                date=self._current_date,
+            )
+            model.add_trade(trade)
+            if self._risk:
+                self._risk.on_trade(trade)
+            if self._exporter:
+                self._exporter.on_trade(trade)
+
+        return record_trade
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from config.logging_config import logger
+from simulation.backtest import SIMULATION_DIR
+
+DEFAULT_ARRAY_CACHE_DIR = os.path.join(SIMULATION_DIR, ".cache", "arrays")
+
+
+def array_digest(array):
+    """SHA-256 of an array's dtype, shape and content, so equal data gives the same digest wherever it came from."""
+    array = np.ascontiguousarray(array)
+    sha = hashlib.sha256(f"{array.dtype.str}{array.shape}".encode("utf-8"))
+    sha.update(array.tobytes())
+    return sha.hexdigest()
+
+
+class ArrayCache:
+    def __init__(self, directory=DEFAULT_ARRAY_CACHE_DIR, max_bytes=512 * 1024 * 1024):
+        """
+        On-disk cache of computed arrays, shared across runs and processes.
+        Entries are keyed by the content hash of the input array, an indicator name and its
+        parameters, so any change to the input (a different slice, an edited CSV) misses while
+        other parameter sets keep their entries. Arrays are `.npy` files opened memory-mapped.
+        :param directory: Cache directory, created on first write.
+        :param max_bytes: Least recently used entries are removed once the cache grows past this size.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data, indicator, params):
+        """
+        :param data: The input array, or its `array_digest` when it is reused for several lookups.
+        """
+        digest = data if isinstance(data, str) else array_digest(data)
+        payload = json.dumps([digest, indicator, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def get(self, data, indicator, params):
+        """Return the cached array as a read-only memory map, or None."""
+        path = self.path(self.key(data, indicator, params))
+        try:
+            array = np.load(path, mmap_mode="r")
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return array
+
+    def put(self, data, indicator, params, array):
+        """Store an array and evict old entries if the cache is over its size limit."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(self.key(data, indicator, params))
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, mode='wb') as file:
+            np.save(file, np.asarray(array))
+        os.replace(temporary, path)  # Readers in other processes never see a partial file
+        self.evict()
+
+    def get_or_compute(self, data, indicator, params, compute):
+        """
+        Return the cached array, or call `compute()` and cache its result.
+        :param data: The input array, or its `array_digest`.
+        :param indicator: Name of the computation, e.g. "sma".
+        :param params: JSON-serializable parameters of the computation.
+        """
+        array = self.get(data, indicator, params)
+        if array is None:
+            array = np.asarray(compute())
+            try:
+                self.put(data, indicator, params, array)
+            except OSError as e:
+                logger.warning(f"Could not cache {indicator} {params}: {e}")
+        return array
+
+    def entries(self):
+        """Return (path, size, last used) for every entry, least recently used first."""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npy"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Removed by another process
+            entries.append((path, stat.st_size, stat.st_mtime))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in `max_bytes`."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,183 @@
+import numpy as np
+
+from config.logging_config import logger
+from modules.rules import Rule, compare, parse_rule
+from simulation.cache import array_digest
+
+
+def sma(prices, window):
+    """Simple moving average of `prices`, NaN until `window` prices are available."""
+    result = np.full(len(prices), np.nan)
+    if window <= len(prices):
+        cumulative = np.cumsum(prices, dtype=float)
+        cumulative = np.concatenate(([0.0], cumulative))
+        result[window - 1:] = (cumulative[window:] - cumulative[:-window]) / window
+    return result
+
+
+def _operand_array(operand, prices, cache):
+    """Array of operand values over time, or None for wallet fields that depend on the trading path."""
+    if operand.uses_wallet:
+        return None
+    if operand.kind == "number":
+        return np.full(len(prices), operand.value)
+    if operand.kind == "field":
+        return prices
+    if operand.key not in cache:
+        cache[operand.key] = sma(prices, operand.value)
+    return cache[operand.key]
+
+
+def _clause_mask(clause, prices, cache):
+    left = _operand_array(clause.left, prices, cache)
+    right = _operand_array(clause.right, prices, cache)
+    if left is None or right is None:
+        # Checked per signal in the sequential pass
+        return np.ones(len(prices), dtype=bool)
+
+    with np.errstate(invalid="ignore"):
+        if clause.comparator == ">":
+            return left > right
+        if clause.comparator == "<":
+            return left < right
+        if clause.comparator == ">=":
+            return left >= right
+        if clause.comparator == "<=":
+            return left <= right
+
+        previous_left = np.concatenate(([np.nan], left[:-1]))
+        previous_right = np.concatenate(([np.nan], right[:-1]))
+        if clause.comparator == "crosses above":
+            return (previous_left <= previous_right) & (left > right)
+        return (previous_left >= previous_right) & (left < right)
+
+
+def signal_masks(rules, prices, cache=None):
+    """
+    Evaluate the price-based part of every rule over the whole series at once.
+    NaN comparisons are False, which matches the streaming evaluator during warm-up.
+    :param cache: Optional dict that receives the computed indicator arrays, keyed like Operand.key.
+    :return: Boolean array of shape (len(rules), len(prices)).
+    """
+    prices = np.asarray(prices, dtype=float)
+    cache = {} if cache is None else cache
+    masks = np.ones((len(rules), len(prices)), dtype=bool)
+    for index, rule in enumerate(rules):
+        for clause in rule.clauses:
+            masks[index] &= _clause_mask(clause, prices, cache)
+    return masks
+
+
+class VectorizedRuleBacktest:
+    def __init__(self, rules, initial_investment=2000, array_cache=None):
+        """
+        Batch evaluator for the same rules RuleStrategy runs live.
+        Indicators and price conditions are computed with NumPy over the whole series;
+        only ticks where some rule's price conditions hold are visited one by one, to
+        apply the wallet conditions and trades in order.
+        :param rules: Rule strings or parsed Rule objects.
+        :param array_cache: Optional ArrayCache that keeps indicators, signal masks and results across runs.
+        """
+        self.rules = [rule if isinstance(rule, Rule) else parse_rule(rule) for rule in rules]
+        self.initial_investment = initial_investment
+        self.array_cache = array_cache
+
+    def run(self, prices):
+        """
+        Run the rules over one symbol's prices, filling at the given price.
+        With an array cache, results for the same prices, rules and investment are reused, and
+        otherwise each rule's signal mask and each SMA computed in earlier runs, so changing
+        one rule only recomputes what it introduces.
+        :return: Dictionary with "trades" as (index, action, amount, price) tuples and
+            "usd", "position" and "equity" arrays aligned with `prices`.
+        """
+        prices = np.asarray(prices, dtype=float)
+        if self.array_cache is None:
+            indicators = {}
+            return self._simulate(prices, signal_masks(self.rules, prices, indicators), indicators)
+
+        cache = self.array_cache
+        digest = array_digest(prices)
+        params = {"rules": [rule.text for rule in self.rules], "initial_investment": self.initial_investment}
+        series = cache.get(digest, "rule_series", params)
+        trades = cache.get(digest, "rule_trades", params)
+        if series is not None and trades is not None:
+            return self._result(prices, series[0], series[1], [
+                (int(index), "BUY" if side > 0 else "SELL", float(amount), float(price))
+                for index, side, amount, price in trades
+            ])
+
+        indicators = {}
+        for window in sorted({window for rule in self.rules for window in rule.sma_windows}):
+            indicators[("sma", window)] = cache.get_or_compute(
+                digest, "sma", {"window": window},
+                lambda window=window: sma(prices, window),
+            )
+        masks = np.array([
+            cache.get_or_compute(digest, "rule_mask", {"rule": rule.text},
+                                 lambda rule=rule: signal_masks([rule], prices, indicators)[0])
+            for rule in self.rules
+        ], dtype=bool).reshape(len(self.rules), len(prices))
+
+        result = self._simulate(prices, masks, indicators)
+        try:
+            cache.put(digest, "rule_series", params, np.vstack([result["usd"], result["position"]]))
+            cache.put(digest, "rule_trades", params, np.array([
+                (index, 1.0 if action == "BUY" else -1.0, amount, price)
+                for index, action, amount, price in result["trades"]
+            ], dtype=float).reshape(-1, 4))
+        except OSError as e:
+            logger.warning(f"Could not cache rule backtest results: {e}")
+        return result
+
+    def _simulate(self, prices, masks, indicators):
+        """Apply the wallet conditions and trades in order at the ticks where some rule's price conditions hold."""
+        usd_delta = np.zeros(len(prices))
+        position_delta = np.zeros(len(prices))
+        usd, position = float(self.initial_investment), 0.0
+        trades = []
+
+        for index in np.flatnonzero(masks.any(axis=0)):
+            price = prices[index]
+            if price <= 0:
+                continue
+            for rule_index, rule in enumerate(self.rules):
+                if not masks[rule_index, index]:
+                    continue
+                values = {("field", "usd"): usd, ("field", "position"): position, ("field", "price"): price}
+                for key, series in indicators.items():
+                    values[key] = None if np.isnan(series[index]) else series[index]
+                if not all(self._check_wallet(clause, values) for clause in rule.clauses if clause.uses_wallet):
+                    continue
+
+                if rule.action == "BUY":
+                    amount = usd * rule.fraction / price
+                    cost = amount * price
+                    usd, position = usd - cost, position + amount
+                    usd_delta[index] -= cost
+                    position_delta[index] += amount
+                else:
+                    amount = position * rule.fraction
+                    proceeds = amount * price
+                    usd, position = usd + proceeds, position - amount
+                    usd_delta[index] += proceeds
+                    position_delta[index] -= amount
+                if amount > 0:
+                    trades.append((int(index), rule.action, amount, price))
+
+        return self._result(prices, self.initial_investment + np.cumsum(usd_delta), np.cumsum(position_delta), trades)
+
+    @staticmethod
+    def _result(prices, usd_series, position_series, trades):
+        return {
+            "trades": trades,
+            "usd": usd_series,
+            "position": position_series,
+            "equity": usd_series + position_series * prices,
+        }
+
+    @staticmethod
+    def _check_wallet(clause, values):
+        left = clause.left.value if clause.left.kind == "number" else values.get(clause.left.key)
+        right = clause.right.value if clause.right.kind == "number" else values.get(clause.right.key)
+        return compare(clause.comparator, left, right)
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from config.logging_config import logger
+from modules.strategies import parameter_grid
+from simulation.backtest import Backtest, SIMULATION_DIR, load_default_prices, merge_series
+
+DEFAULT_CACHE_DIR = os.path.join(SIMULATION_DIR, ".cache", "walk_forward")
+# Part of every fold's cache key; bump it when fold results change for the same inputs
+FOLD_CACHE_VERSION = 2
+
+
+def _init_worker():
+    """Keep per-tick debug logging from flooding the output of every worker process."""
+    logger.setLevel(logging.WARNING)
+
+
+def _run_fold(strategy_name, grid, train, test, initial_investment):
+    """
+    Optimize parameters on the train window and score them on the test window,
+    with the strategy warmed up on the train window.
+    Defined at module level so it can be sent to worker processes.
+    """
+    best_params, best_result = None, None
+    for params in parameter_grid(strategy_name, grid):
+        result = Backtest(strategy_name, params, initial_investment).run(train)
+        if best_result is None or result.total_return > best_result.total_return:
+            best_params, best_result = params, result
+
+    # Warm the indicators on the train window, so long windows can trade from the first test event
+    test_result = Backtest(strategy_name, best_params, initial_investment).run(test, warm_up=train)
+    return {
+        "params": best_params,
+        "train_return": best_result.total_return,
+        "test_return": test_result.total_return,
+        "trades": len(test_result.trades),
+        "start": test[0][0],
+        "end": test[-1][0],
+        "equity": test_result.equity,
+    }
+
+
+class WalkForwardResult:
+    def __init__(self, folds, equity, initial_investment):
+        """
+        :param folds: Per-fold dicts with the chosen params and train/test returns.
+        :param equity: Out-of-sample equity curve stitched across all test windows.
+        """
+        self.folds = folds
+        self.equity = equity
+        self.initial_investment = initial_investment
+
+    @property
+    def total_return(self):
+        if not self.equity or not self.initial_investment:
+            return 0.0
+        return self.equity[-1][1] / self.initial_investment - 1
+
+    def __repr__(self):
+        return (
+            f"WalkForwardResult("
+            f"Folds: {len(self.folds)}, "
+            f"Out-of-sample Return: {self.total_return * 100:.2f}%"
+            f")"
+        )
+
+
+class WalkForwardOptimizer:
+    def __init__(self, strategy_name, grid=None, train_size=200, test_size=50, initial_investment=2000,
+                 workers=None, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Rolling train/test optimization of a registered strategy.
+        :param strategy_name: Key in `modules.strategies.STRATEGIES`.
+        :param grid: Optional parameter grid, defaults to the strategy's own grid.
+        :param train_size: Number of price events in each train window.
+        :param test_size: Number of price events in each test window; windows advance by this much.
+        :param workers: Number of worker processes, defaults to the CPU count.
+        :param cache_dir: Directory for per-fold results, or None to disable caching.
+        """
+        if train_size <= 0 or test_size <= 0:
+            raise ValueError("train_size and test_size must be positive.")
+
+        self.strategy_name = strategy_name
+        self.grid = grid
+        self.train_size = train_size
+        self.test_size = test_size
+        self.initial_investment = initial_investment
+        self.workers = workers
+        self.cache_dir = cache_dir
+
+    def folds(self, events):
+        """
+        Split events into (train, test) windows. Windows are anchored at the start
+        of the data, so appending new events never moves the existing folds.
+        """
+        folds = []
+        start = 0
+        while start + self.train_size + self.test_size <= len(events):
+            train = events[start:start + self.train_size]
+            test = events[start + self.train_size:start + self.train_size + self.test_size]
+            folds.append((train, test))
+            start += self.test_size
+        return folds
+
+    def run(self, events):
+        """
+        Run every fold, reusing cached fold results, and stitch the test equity curves.
+        :param events: (timestamp_ms, symbol, price) events, e.g. from `merge_series`.
+        :return: A WalkForwardResult.
+        """
+        folds = self.folds(events)
+        results = [None] * len(folds)
+        pending = {}
+
+        for index, (train, test) in enumerate(folds):
+            key = self._fold_key(train, test)
+            cached = self._load_cached(key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending[index] = key
+
+        logger.info(f"Walk-forward {self.strategy_name}: {len(folds)} folds, {len(pending)} to compute.")
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+                futures = {
+                    index: executor.submit(_run_fold, self.strategy_name, self.grid, folds[index][0],
+                                           folds[index][1], self.initial_investment)
+                    for index in pending
+                }
+                for index, future in futures.items():
+                    results[index] = future.result()
+                    self._store_cached(pending[index], results[index])
+
+        return WalkForwardResult(results, self._stitch(results), self.initial_investment)
+
+    def _stitch(self, results):
+        """
+        Chain the test equity curves: each fold starts from a fresh wallet, so its
+        curve is rescaled to begin where the previous fold ended.
+        """
+        stitched = []
+        balance = self.initial_investment
+        for result in results:
+            equity = result["equity"]
+            if not equity:
+                continue
+            scale = balance / self.initial_investment
+            stitched.extend((timestamp, value * scale) for timestamp, value in equity)
+            balance = stitched[-1][1]
+        return stitched
+
+    def _fold_key(self, train, test):
+        payload = json.dumps(
+            [FOLD_CACHE_VERSION, self.strategy_name, self.grid, self.initial_investment, train, test],
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_cached(self, key):
+        if not self.cache_dir:
+            return None
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, mode='r') as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable walk-forward cache entry {path}: {e}")
+            return None
+
+    def _store_cached(self, key, result):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, mode='w') as file:
+            json.dump(result, file)
+        os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    events = merge_series(load_default_prices())
+    for name in ("moving_average", "percentage_based"):
+        result = WalkForwardOptimizer(name, train_size=200, test_size=50).run(events)
+        print(f"{name}: {result}")
+        for fold in result.folds:
+            print(f"  {fold['params']} train={fold['train_return'] * 100:.2f}% test={fold['test_return'] * 100:.2f}%")
@@ -0,0 +1,234 @@
+"""
+Download long price histories from CoinGecko's `market_chart/range` endpoint.
+
+    python -m utility.backfill --start 2024-10-01 --end 2024-11-25 --symbols BTC ETH --workers 4
+
+The range is split into chunks that are fetched in parallel with retries. Finished
+chunks are recorded in a checkpoint file, so running the same command again after an
+interruption only downloads what is missing. Prices are merged into
+`timestamp,price` CSVs in the format the backtests read, sorted by time and without
+duplicate timestamps. They go to the untracked `data/backfill/` by default, so the
+bundled `simulation/` fixtures only change when `--output-dir` points there on purpose.
+`--base-url` points the tool at another server, e.g. a local stand-in.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from config.logging_config import logger
+
+DEFAULT_BASE_URL = "https://api.coingecko.com/api/v3"
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "backfill")
+COINGECKO_IDS = {"BTC": "bitcoin", "ETH": "ethereum"}
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class BackfillError(Exception):
+    """Raised when a chunk cannot be downloaded."""
+
+
+def split_range(start, end, chunk_seconds):
+    """Split [start, end) in epoch seconds into consecutive (start, end) chunks."""
+    chunks = []
+    while start < end:
+        chunks.append((start, min(start + chunk_seconds, end)))
+        start += chunk_seconds
+    return chunks
+
+
+def read_price_csv(path):
+    """Load a `timestamp,price` CSV into a dict of timestamp_ms -> price, empty if the file does not exist."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, mode='r', newline='') as file:
+        reader = csv.reader(file)
+        next(reader, None)  # Skip the header row
+        return {int(row[0]): float(row[1]) for row in reader if row}
+
+
+def write_price_csv(path, prices):
+    """Write timestamp_ms -> price as a sorted `timestamp,price` CSV, replacing the file atomically."""
+    temporary = f"{path}.tmp"
+    with open(temporary, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["timestamp", "price"])
+        writer.writerows(sorted(prices.items()))
+    os.replace(temporary, path)
+
+
+class Backfill:
+    def __init__(self, symbols=("BTC", "ETH"), start=None, end=None, chunk_seconds=24 * 60 * 60, workers=4,
+                 output_dir=DEFAULT_OUTPUT_DIR, checkpoint=None, base_url=DEFAULT_BASE_URL, vs_currency="usd",
+                 retries=5, backoff=2.0, timeout=30, save_every=10):
+        """
+        :param symbols: Asset codes to download, keys of `COINGECKO_IDS`.
+        :param start: Range start in epoch seconds, defaults to 30 days before `end`.
+        :param end: Range end in epoch seconds, defaults to now.
+        :param chunk_seconds: Length of one request. CoinGecko picks the spacing of the returned prices
+            from the requested range, so shorter chunks can give finer data; it is not checked here.
+        :param workers: Maximum concurrent requests.
+        :param output_dir: Directory for the `<symbol>_prices.csv` files.
+        :param checkpoint: JSON file listing finished chunks, defaults to `.backfill.json` in `output_dir`.
+        :param retries: Attempts per chunk for rate limits, server errors and network errors.
+        :param backoff: Base delay in seconds, doubled after every failed attempt.
+        :param save_every: Write the CSVs and checkpoint after this many finished chunks.
+        """
+        self.symbols = tuple(symbols)
+        unknown = [symbol for symbol in self.symbols if symbol not in COINGECKO_IDS]
+        if unknown:
+            raise ValueError(f"Unsupported symbols: {', '.join(unknown)}")
+        self.end = int(end if end is not None else time.time())
+        self.start = int(start if start is not None else self.end - 30 * 24 * 60 * 60)
+        self.chunk_seconds = chunk_seconds
+        self.workers = workers
+        self.output_dir = output_dir
+        self.checkpoint = checkpoint or os.path.join(output_dir, ".backfill.json")
+        self.base_url = base_url.rstrip("/")
+        self.vs_currency = vs_currency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.save_every = save_every
+
+    def output_path(self, symbol):
+        return os.path.join(self.output_dir, f"{symbol.lower()}_prices.csv")
+
+    def chunk_key(self, symbol, chunk):
+        return f"{symbol}:{self.vs_currency}:{chunk[0]}:{chunk[1]}"
+
+    def pending_chunks(self, done):
+        return [
+            (symbol, chunk)
+            for symbol in self.symbols
+            for chunk in split_range(self.start, self.end, self.chunk_seconds)
+            if self.chunk_key(symbol, chunk) not in done
+        ]
+
+    def run(self):
+        """
+        Download every chunk that is not checkpointed yet.
+        :return: Dictionary of asset code to the number of rows in its CSV.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        done = self._load_checkpoint()
+        pending = self.pending_chunks(done)
+        logger.info(f"Backfill: {len(pending)} chunks to download, {len(done)} already done.")
+
+        prices = {symbol: read_price_csv(self.output_path(symbol)) for symbol in self.symbols}
+        unsaved, failed = 0, 0
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        futures = {executor.submit(self.fetch_chunk, symbol, chunk): (symbol, chunk) for symbol, chunk in pending}
+        try:
+            for future in as_completed(futures):
+                symbol, chunk = futures[future]
+                try:
+                    rows = future.result()
+                except BackfillError as e:
+                    failed += 1
+                    logger.error(f"Backfill chunk {self.chunk_key(symbol, chunk)} failed: {e}")
+                    continue
+                prices[symbol].update(rows)
+                done.add(self.chunk_key(symbol, chunk))
+                unsaved += 1
+                if unsaved >= self.save_every:
+                    self._save(prices, done)
+                    unsaved = 0
+        finally:
+            # Also runs on Ctrl+C, so everything downloaded so far is kept
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            self._save(prices, done)
+
+        if failed:
+            logger.warning(f"Backfill finished with {failed} failed chunks, run it again to retry them.")
+        return {symbol: len(rows) for symbol, rows in prices.items()}
+
+    def fetch_chunk(self, symbol, chunk):
+        """
+        Download one chunk with retries.
+        :return: List of (timestamp_ms, price) rows within the chunk.
+        :raises BackfillError: When every attempt failed or the server rejected the request.
+        """
+        start, end = chunk
+        query = urllib.parse.urlencode({"vs_currency": self.vs_currency, "from": start, "to": end})
+        url = f"{self.base_url}/coins/{COINGECKO_IDS[symbol]}/market_chart/range?{query}"
+
+        for attempt in range(self.retries):
+            delay = self.backoff * 2 ** attempt * (1 + random.random() / 2)  # Jitter spreads out the workers
+            try:
+                with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                    data = json.load(response)
+                # The endpoint includes both ends, so keep [start, end) to let chunks line up exactly
+                return [
+                    (int(timestamp), float(price))
+                    for timestamp, price in data.get("prices", [])
+                    if start * 1000 <= timestamp < end * 1000
+                ]
+            except urllib.error.HTTPError as e:
+                if e.code not in RETRY_STATUSES:
+                    raise BackfillError(f"HTTP {e.code} for {url}")
+                retry_after = e.headers.get("Retry-After") if e.headers else None
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                logger.warning(f"HTTP {e.code} for {symbol} chunk {start}, retrying in {delay:.1f}s...")
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                logger.warning(f"Request for {symbol} chunk {start} failed ({e}), retrying in {delay:.1f}s...")
+            if attempt + 1 < self.retries:
+                time.sleep(delay)
+        raise BackfillError(f"Giving up on {url} after {self.retries} attempts")
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint):
+            return set()
+        with open(self.checkpoint, mode='r') as file:
+            return set(json.load(file).get("done", []))
+
+    def _save(self, prices, done):
+        # Prices first: a chunk only counts as done once its rows are on disk
+        for symbol, rows in prices.items():
+            write_price_csv(self.output_path(symbol), rows)
+        temporary = f"{self.checkpoint}.tmp"
+        with open(temporary, mode='w') as file:
+            json.dump({"done": sorted(done)}, file)
+        os.replace(temporary, self.checkpoint)
+
+
+def _parse_date(value):
+    return int(datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill historical prices from CoinGecko.")
+    parser.add_argument("--symbols", nargs="+", default=["BTC", "ETH"], help="Asset codes, e.g. BTC ETH")
+    parser.add_argument("--start", type=_parse_date, help="First day (UTC), YYYY-MM-DD; defaults to 30 days ago")
+    parser.add_argument("--end", type=_parse_date, help="Day to stop before (UTC), YYYY-MM-DD; defaults to now")
+    parser.add_argument("--chunk-hours", type=float, default=24, help="Hours of data per request")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum concurrent requests")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Directory for the price CSVs")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="API base URL")
+    args = parser.parse_args(argv)
+
+    backfill = Backfill(
+        symbols=args.symbols,
+        start=args.start,
+        end=args.end,
+        chunk_seconds=int(args.chunk_hours * 60 * 60),
+        workers=args.workers,
+        output_dir=args.output_dir,
+        base_url=args.base_url,
+    )
+    for symbol, rows in backfill.run().items():
+        print(f"{symbol}: {rows} prices in {backfill.output_path(symbol)}")
+
+
+if __name__ == "__main__":
+    main()
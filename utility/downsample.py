@@ -0,0 +1,96 @@
+def lttb(points, threshold):
+    """
+    Downsample (x, y) points with Largest-Triangle-Three-Buckets, which keeps the
+    visual shape of a series (peaks and troughs) while drawing a fixed number of points.
+    :param points: List of (x, y) pairs sorted by x.
+    :param threshold: Number of points to keep.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    bucket_size = (n - 2) / (threshold - 2)
+    sampled = [points[0]]
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        avg_start = int((bucket + 1) * bucket_size) + 1
+        avg_end = min(int((bucket + 2) * bucket_size) + 1, n)
+        avg_count = avg_end - avg_start
+        avg_x = sum(point[0] for point in points[avg_start:avg_end]) / avg_count
+        avg_y = sum(point[1] for point in points[avg_start:avg_end]) / avg_count
+
+        ax, ay = points[selected]
+        max_area = -1
+        for index in range(int(bucket * bucket_size) + 1, int((bucket + 1) * bucket_size) + 1):
+            x, y = points[index]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                next_selected = index
+
+        sampled.append(points[next_selected])
+        selected = next_selected
+
+    sampled.append(points[-1])
+    return sampled
+
+
+class DownsampledSeries:
+    def __init__(self, max_points=500):
+        """
+        An append-only series that never holds more than `max_points` points, no
+        matter how many are appended.
+
+        Raw points are grouped into buckets and one point per bucket is kept, picked
+        the LTTB way. When the series fills up it is compacted to half its size
+        with `lttb` and the bucket size doubles, so appends stay amortized O(1).
+        `compactions` changes whenever already published points were replaced, which
+        tells a chart that it has to redraw instead of only appending.
+        """
+        if max_points < 4:
+            raise ValueError("max_points must be at least 4.")
+
+        self.max_points = max_points
+        self.bucket_size = 1
+        self.compactions = 0
+        self._points = []
+        self._pending = []
+
+    def __len__(self):
+        return len(self._points)
+
+    def append(self, x, y):
+        self._pending.append((x, y))
+        if len(self._pending) < self.bucket_size:
+            return
+
+        self._points.append(self._select(self._pending))
+        self._pending = []
+
+        if len(self._points) >= self.max_points:
+            self._points = lttb(self._points, self.max_points // 2)
+            self.bucket_size *= 2
+            self.compactions += 1
+
+    def _select(self, bucket):
+        """Pick the bucket point forming the largest triangle with the last kept point and the bucket mean."""
+        if len(bucket) == 1 or not self._points:
+            return bucket[0]
+
+        ax, ay = self._points[-1]
+        avg_x = sum(point[0] for point in bucket) / len(bucket)
+        avg_y = sum(point[1] for point in bucket) / len(bucket)
+        return max(bucket, key=lambda point: abs((ax - avg_x) * (point[1] - ay) - (ax - point[0]) * (avg_y - ay)))
+
+    def points(self, include_latest=True):
+        """
+        Return the kept points, oldest first.
+        :param include_latest: Also return the newest raw point of the bucket still being filled.
+        """
+        points = list(self._points)
+        pending = self._pending
+        if include_latest and pending:
+            points.append(pending[-1])
+        return points
@@ -0,0 +1,94 @@
+"""
+Report what importing a module costs, using `python -X importtime`.
+
+    python -m utility.import_report services.trading_bot --top 15
+    python -m utility.import_report main modules.strategies --budget-ms 300
+
+Each module is imported in a fresh interpreter, so results do not depend on what
+was imported before. With --budget-ms the exit status is 1 when any module's total
+import time exceeds the budget, which makes the report usable as a startup check.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_importtime(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_DIR, capture_output=True, text=True,
+    )
+
+
+def _parse(stderr):
+    entries, errors = [], []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+        fields = [field.strip() for field in line[len("import time:"):].split("|")]
+        if len(fields) != 3 or not fields[0].isdigit():
+            continue  # Header row
+        entries.append((fields[2], int(fields[0]), int(fields[1])))
+    return entries, errors
+
+
+def measure_import(module):
+    """
+    Import `module` in a new interpreter and return its import-time entries, leaving
+    out the modules the interpreter imports at startup anyway.
+    :return: List of (module name, self microseconds, cumulative microseconds), in import order.
+    :raises ImportError: If the import fails.
+    """
+    startup = {name for name, _, _ in _parse(_run_importtime("pass").stderr)[0]}
+    process = _run_importtime(f"import {module}")
+    entries, errors = _parse(process.stderr)
+    if process.returncode != 0:
+        raise ImportError(f"Importing {module} failed:\n" + "\n".join(errors))
+    return [entry for entry in entries if entry[0] not in startup]
+
+
+def import_report(module, top=20):
+    """
+    Return (total microseconds, slowest entries) for importing `module`, with the
+    entries sorted by cumulative time.
+    """
+    entries = measure_import(module)
+    total = sum(own for _, own, _ in entries)
+    return total, sorted(entries, key=lambda entry: entry[2], reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the import time of project modules.")
+    parser.add_argument("modules", nargs="+", help="Dotted module names, e.g. services.trading_bot")
+    parser.add_argument("--top", type=int, default=20, help="Number of slowest imports to list per module")
+    parser.add_argument("--budget-ms", type=float, help="Fail when a module takes longer than this to import")
+    args = parser.parse_args(argv)
+
+    over_budget = []
+    for module in args.modules:
+        try:
+            total, entries = import_report(module, args.top)
+        except ImportError as e:
+            print(e)
+            over_budget.append(module)
+            continue
+
+        print(f"{module}: {total / 1000:.1f} ms")
+        print(f"  {'cumulative ms':>13}  {'self ms':>8}  module")
+        for name, own, cumulative in entries:
+            print(f"  {cumulative / 1000:13.1f}  {own / 1000:8.1f}  {name}")
+        if args.budget_ms is not None and total / 1000 > args.budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"Over budget or failed: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,6 @@
 import csv
 import os
 
-import requests
-
 
 def save_to_csv(data, filename):
     """Save historical price data to a CSV file."""
@@ -47,6 +45,8 @@ def get_historical_prices_coingecko_append(symbol: str, vs_currency: str = "usd"
     :param filename: CSV filename to save/load data.
     :return: List of [timestamp, price] pairs.
     """
+    import requests
+
     new_data = []
 
     print(f"Fetching historical prices for {symbol}...")
@@ -74,5 +74,6 @@ def get_historical_prices_coingecko_append(symbol: str, vs_currency: str = "usd"
         return new_data
 
 
-btc_prices = get_historical_prices_coingecko_append("bitcoin", days=1, filename="btc_prices.csv")
-eth_prices = get_historical_prices_coingecko_append("ethereum", days=1, filename="eth_prices.csv")
+if __name__ == "__main__":
+    btc_prices = get_historical_prices_coingecko_append("bitcoin", days=1, filename="btc_prices.csv")
+    eth_prices = get_historical_prices_coingecko_append("ethereum", days=1, filename="eth_prices.csv")
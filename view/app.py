@@ -0,0 +1,38 @@
+from kivy.lang import Builder
+from kivymd.app import MDApp
+from kivymd.uix.screenmanager import MDScreenManager
+
+from view.screens import screens
+
+
+class MyApp(MDApp):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # This is the screen manager that will contain all the screens of your
+        # application.
+        self.manager_screens = MDScreenManager()
+
+    def build(self) -> MDScreenManager:
+        self.generate_application_screens()
+        return self.manager_screens
+
+    def generate_application_screens(self) -> None:
+        """
+        Creating and adding screens to the screen manager.
+        You should not change this cycle unnecessarily. He is self-sufficient.
+
+        If you need to add any screen, open the `View.screens.py` module and
+        see how new screens are added according to the given application
+        architecture.
+        """
+
+        for i, name_screen in enumerate(screens.keys()):
+            # Only the kv rules of the screens being created are parsed, instead of
+            # walking the whole project directory for .kv files
+            Builder.load_file(screens[name_screen]["kv"])
+            model = screens[name_screen]["model"]()
+            controller = screens[name_screen]["controller"](model)
+            view = controller.get_view()
+            view.manager_screens = self.manager_screens
+            view.name = name_screen
+            self.manager_screens.add_widget(view)
@@ -0,0 +1,88 @@
+from kivy.graphics import Color, Line, PopMatrix, PushMatrix, Scale, Translate
+from kivy.properties import ColorProperty, NumericProperty
+from kivy.uix.widget import Widget
+
+
+class PriceChart(Widget):
+    """
+    Line chart of a `DownsampledSeries`.
+
+    Points are kept in data coordinates and mapped to the widget with a
+    Translate/Scale pair, so a refresh only appends the newly kept points and
+    adjusts the transform; the whole line is rebuilt only after the series
+    has been compacted.
+    """
+
+    line_color = ColorProperty([0.13, 0.59, 0.95, 1])
+    padding = NumericProperty(4)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._origin = None  # Data offset keeping vertex values small enough for GL floats
+        self._drawn = 0
+        self._compactions = None
+        self._bounds = None  # min_x, max_x, min_y, max_y in relative data coordinates
+
+        with self.canvas:
+            self._color = Color(*self.line_color)
+            PushMatrix()
+            self._translate = Translate(0, 0)
+            self._scale = Scale(1, 1, 1)
+            self._line = Line(points=[])
+            self._tail = Line(points=[])
+            PopMatrix()
+
+        self.bind(pos=self._update_transform, size=self._update_transform)
+        self.bind(line_color=lambda instance, value: setattr(self._color, "rgba", value))
+
+    def update(self, series):
+        """Draw the points added to `series` since the last refresh."""
+        if series is None:
+            return
+
+        points = series.points(include_latest=False)
+        if not points:
+            return
+        if self._origin is None:
+            self._origin = points[0]
+
+        if series.compactions != self._compactions or len(points) < self._drawn:
+            self._compactions = series.compactions
+            self._bounds = None
+            self._line.points = self._extend_bounds(points)
+        elif len(points) > self._drawn:
+            self._line.points = self._line.points + self._extend_bounds(points[self._drawn:])
+        self._drawn = len(points)
+
+        # The newest raw price is not part of the kept points yet, draw it as a short tail
+        latest = series.points()[-1]
+        self._tail.points = self._extend_bounds([points[-1], latest]) if latest is not points[-1] else []
+        self._update_transform()
+
+    def _extend_bounds(self, points):
+        """Convert points to relative coordinates, growing the bounds to include them."""
+        origin_x, origin_y = self._origin
+        flat = []
+        min_x, max_x, min_y, max_y = self._bounds or (float("inf"), float("-inf"), float("inf"), float("-inf"))
+        for x, y in points:
+            x, y = x - origin_x, y - origin_y
+            min_x, max_x = min(min_x, x), max(max_x, x)
+            min_y, max_y = min(min_y, y), max(max_y, y)
+            flat += (x, y)
+        self._bounds = (min_x, max_x, min_y, max_y)
+        return flat
+
+    def _update_transform(self, *args):
+        if self._bounds is None:
+            return
+
+        min_x, max_x, min_y, max_y = self._bounds
+        width = max(self.width - 2 * self.padding, 1)
+        height = max(self.height - 2 * self.padding, 1)
+        scale_x = width / (max_x - min_x) if max_x > min_x else 1
+        scale_y = height / (max_y - min_y) if max_y > min_y else 1
+
+        self._scale.x = scale_x
+        self._scale.y = scale_y
+        self._translate.x = self.x + self.padding - min_x * scale_x
+        self._translate.y = self.y + self.padding - min_y * scale_y
@@ -2,6 +2,7 @@ from kivy.properties import StringProperty, ListProperty
 from kivymd.uix.list import MDListItem, MDListItemHeadlineText, MDListItemSupportingText, MDListItemTertiaryText
 
 from view.base_screen import BaseScreenView
+from view.main_screen.components.price_chart import PriceChart  # noqa: F401 - used in main_screen.kv
 
 
 class MainScreenView(BaseScreenView):
@@ -19,14 +20,18 @@ class MainScreenView(BaseScreenView):
         The view in this method tracks these changes and updates the UI
         according to these changes.
         """
-        # Retrieve balances from Wallet
-        self.usd_balance = f"${self.model.bot.usd_balance:.2f}"
-        self.btc_balance = f"{self.model.bot.btc_balance:.4f}"
-        self.eth_balance = f"{self.model.bot.eth_balance:.4f}"
-        self.total_balance = f'${self.model.bot.total_balance:.2f}'
+        # Retrieve balances from one Wallet snapshot so they are consistent with each other
+        wallet = self.model.bot.wallet.snapshot()
+        self.usd_balance = f"${wallet.get_balance('USD'):.2f}"
+        self.btc_balance = f"{wallet.get_balance('BTC'):.4f}"
+        self.eth_balance = f"{wallet.get_balance('ETH'):.4f}"
+        self.total_balance = f'${self.model.bot.get_total_balance(wallet):.2f}'
         # Retrieve prices from the model
         self.btc_price = f"${self.model.bot.btc_price:.2f}" if self.model.bot.btc_price else "$0.00"
         self.eth_price = f"${self.model.bot.eth_price:.2f}" if self.model.bot.eth_price else "$0.00"
+        # Append the newly kept points to the price charts
+        self.ids.btc_chart.update(self.model.bot.get_chart_series("BTC"))
+        self.ids.eth_chart.update(self.model.bot.get_chart_series("ETH"))
 
 
         # Retrieve trade history
@@ -2,12 +2,17 @@
 # of the screens of the application.
 
 
+import os
+
 from model.main_screen import MainScreenModel
 from controller.main_screen import MainScreenController
 
+VIEW_DIR = os.path.dirname(os.path.abspath(__file__))
+
 screens = {
     "main screen": {
         "model": MainScreenModel,
         "controller": MainScreenController,
+        "kv": os.path.join(VIEW_DIR, "main_screen", "main_screen.kv"),
     },
 }
\ No newline at end of file